@@ -4,7 +4,7 @@ import sys
 import urllib.request
 
 port = os.environ.get("SMIB_WEBSERVER_PORT", "80")
-url = f"http://localhost:{port}/api/ping"
+url = f"http://localhost:{port}/health/live"
 req = urllib.request.Request(url, headers={"x-skip-logging": "true"})
 
 try:
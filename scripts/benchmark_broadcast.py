@@ -0,0 +1,125 @@
+"""
+Websocket broadcast fan-out to simulated clients: BroadcastHub against the sequential send loop it replaced.
+
+For each client count, every broadcast is timed until the broadcaster gets control back (what open_space/close_space
+wait on), and until every healthy client has been sent it. Some of the clients can be made slow, taking --slow-delay
+seconds to accept each message, like a client on a poor connection.
+
+    uv run python scripts/benchmark_broadcast.py [--clients 1000 5000] [--slow 10] [--broadcasts 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Callable, Awaitable
+
+from smib.events.broadcast import BroadcastHub, OverflowPolicy
+
+MESSAGE = {"open": True}
+
+
+class SimulatedWebSocket:
+    """ Stands in for an accepted starlette WebSocket, taking delay seconds to send each message """
+
+    def __init__(self, number: int, delay: float, on_sent: Callable[[], None]):
+        self.client = SimpleNamespace(host=f"client-{number}")
+        self.delay: float = delay
+        self.on_sent: Callable[[], None] = on_sent
+
+    async def send(self) -> None:
+        # Even a fast send yields to the event loop once, as writing to a real socket does
+        await asyncio.sleep(self.delay)
+        self.on_sent()
+
+    async def send_json(self, data) -> None:
+        await self.send()
+
+    async def send_text(self, data: str) -> None:
+        await self.send()
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.send()
+
+    async def close(self, code: int = 1000, reason: str | None = None) -> None:
+        pass
+
+
+class Deliveries:
+    """ Resolves once every healthy client has been sent the current broadcast """
+
+    def __init__(self, healthy: int):
+        self.healthy: int = healthy
+        self.sent: int = 0
+        self.done: asyncio.Future | None = None
+
+    def expect(self) -> asyncio.Future:
+        self.sent, self.done = 0, asyncio.get_running_loop().create_future()
+        return self.done
+
+    def on_sent(self) -> None:
+        self.sent += 1
+        if self.sent == self.healthy and self.done is not None and not self.done.done():
+            self.done.set_result(None)
+
+
+async def sequential_broadcast(websockets: list[SimulatedWebSocket], message: dict) -> None:
+    """ The spacestate plugin's loop before BroadcastHub """
+    for client in websockets.copy():
+        try:
+            await client.send_json(message)
+        except Exception:
+            pass
+
+
+async def run(name: str, clients: int, slow: int, slow_delay: float, broadcasts: int,
+              start: Callable[[list[SimulatedWebSocket]], Awaitable[Callable[[dict], Awaitable[None] | int]]]) -> None:
+    deliveries = Deliveries(clients - slow)
+    # Slow clients are not waited for, they only get in the way of the others
+    websockets = [SimulatedWebSocket(number, slow_delay, lambda: None) if number < slow
+                  else SimulatedWebSocket(number, 0, deliveries.on_sent) for number in range(clients)]
+    broadcast = await start(websockets)
+
+    returned, delivered = [], []
+    for _ in range(broadcasts):
+        done = deliveries.expect()
+        started = time.perf_counter()
+        if asyncio.iscoroutine(result := broadcast(MESSAGE)):
+            await result
+        returned.append(time.perf_counter() - started)
+        await done
+        delivered.append(time.perf_counter() - started)
+
+    print(f"{name:>10} {clients:>6} clients ({slow} slow): returns in p50 {statistics.median(returned) * 1000:8.2f}ms "
+          f"max {max(returned) * 1000:8.2f}ms, all healthy clients sent in p50 {statistics.median(delivered) * 1000:8.2f}ms "
+          f"max {max(delivered) * 1000:8.2f}ms")
+
+
+async def main(client_counts: list[int], slow: int, slow_delay: float, broadcasts: int) -> None:
+    async def start_sequential(websockets):
+        return lambda message: sequential_broadcast(websockets, message)
+
+    hubs: list[BroadcastHub] = []
+
+    async def start_hub(websockets):
+        # As the spacestate plugin configures it
+        hub = BroadcastHub("benchmark", overflow=OverflowPolicy.COALESCE)
+        hubs.append(hub)
+        for websocket in websockets:
+            hub.subscribe(websocket)
+        return hub.broadcast
+
+    for clients in client_counts:
+        await run("sequential", clients, slow, slow_delay, broadcasts, start_sequential)
+        await run("hub", clients, slow, slow_delay, broadcasts, start_hub)
+        await hubs.pop().close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1000, 5000], help="Simulated client counts to run")
+    parser.add_argument("--slow", type=int, default=10, help="Clients that are slow to accept each message")
+    parser.add_argument("--slow-delay", type=float, default=0.05, help="Seconds a slow client takes to accept a message")
+    parser.add_argument("--broadcasts", type=int, default=20, help="Broadcasts to time for each client count")
+    args = parser.parse_args()
+    asyncio.run(main(args.clients, args.slow, args.slow_delay, args.broadcasts))
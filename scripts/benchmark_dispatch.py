@@ -0,0 +1,122 @@
+"""
+Cost of dispatching an HTTP request to its Bolt listener, as the number of routes grows.
+
+Compares matching by listener key through the per-kind listener registry (what SMIB does) with the route matcher it
+replaced, which re-ran route.matches(scope) for every route's listener until one matched. Both dispatch the same Bolt
+request, built by SMIB's HttpEventHandler, through the same Bolt app and middleware; only the listener matching differs.
+The request is for the last route registered, the worst case for the route matcher.
+
+    uv run python scripts/benchmark_dispatch.py [--routes 10 50 200 1000] [--requests 2000]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import APIRouter
+from slack_bolt.app.async_app import AsyncApp
+from slack_bolt.authorization import AuthorizeResult
+from starlette.requests import Request
+from starlette.routing import BaseRoute, Match
+
+from smib.events import BoltEventType
+from smib.events.dispatcher import bind_listeners, dispatch
+from smib.events.handlers.http_event_handler import to_async_bolt_request
+from smib.events.interfaces import generate_listener_key, generate_listener_key_matcher
+from smib.events.middlewares.bolt_middleware import apply_internal_request_middleware_chains
+
+
+async def authorize(**kwargs) -> AuthorizeResult:
+    # Stands in for the bot token's auth.test, which Bolt makes once and caches
+    return AuthorizeResult(enterprise_id=None, team_id="T0", bot_token="xoxb-benchmark", bot_id="B0", bot_user_id="U0")
+
+
+def create_bolt_app() -> AsyncApp:
+    # As SMIB creates it, without a Slack connection
+    bolt_app = AsyncApp(name="benchmark", signing_secret="benchmark", authorize=authorize,
+                        raise_error_for_unhandled_request=True, process_before_response=True)
+    apply_internal_request_middleware_chains(bolt_app)
+    return bolt_app
+
+
+def generate_route_matcher(route: BaseRoute):
+    """ The listener matcher before listener keys """
+    async def matcher(event: dict) -> bool:
+        match_result = route.matches(event['request']['scope'])
+        return Match(match_result[0]) == Match.FULL
+
+    return matcher
+
+
+async def listener() -> None:
+    pass
+
+
+async def endpoint(item_id: str) -> None:
+    pass
+
+
+def create_request(route_number: int) -> Request:
+    path = f"/api/plugin{route_number}/items/42"
+    return Request({
+        "type": "http", "method": "GET", "scheme": "http", "server": ("localhost", 80), "root_path": "",
+        "path": path, "raw_path": path.encode(), "query_string": b"", "headers": [(b"host", b"localhost")],
+        "path_params": {"item_id": "42"},
+    })
+
+
+async def time_dispatches(requests: int, dispatch_once) -> list[float]:
+    for _ in range(min(requests, 100)):
+        await dispatch_once()
+
+    durations = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        await dispatch_once()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+async def benchmark(route_count: int, requests: int) -> None:
+    router = APIRouter()
+    for number in range(route_count):
+        router.add_api_route(f"/api/plugin{number}/items/{{item_id}}", endpoint, methods=["GET"])
+    request = create_request(route_count - 1)
+
+    route_matching_app = create_bolt_app()
+    for route in router.routes:
+        route_matching_app.event(BoltEventType.HTTP, matchers=[generate_route_matcher(route)])(listener)
+
+    listener_key_app = create_bolt_app()
+    listener_keys = [generate_listener_key() for _ in router.routes]
+    for listener_key in listener_keys:
+        with bind_listeners(listener_key_app, BoltEventType.HTTP, listener_key):
+            listener_key_app.event(BoltEventType.HTTP, matchers=[generate_listener_key_matcher(listener_key)])(listener)
+
+    async def dispatch_by_route():
+        bolt_request = await to_async_bolt_request(request, {}, listener_keys[-1])
+        response = await route_matching_app.async_dispatch(bolt_request)
+        assert response.status == 200, response.body
+
+    async def dispatch_by_listener_key():
+        bolt_request = await to_async_bolt_request(request, {}, listener_keys[-1])
+        response = await dispatch(listener_key_app, bolt_request, BoltEventType.HTTP, listener_keys[-1])
+        assert response.status == 200, response.body
+
+    for name, dispatch_once in (("route matching", dispatch_by_route), ("listener key", dispatch_by_listener_key)):
+        durations = await time_dispatches(requests, dispatch_once)
+        print(f"{route_count:>5} routes, {name:>14}: p50 {statistics.median(durations) * 1e6:8.1f}us "
+              f"p99 {statistics.quantiles(durations, n=100)[98] * 1e6:8.1f}us")
+
+
+async def main(route_counts: list[int], requests: int) -> None:
+    for route_count in route_counts:
+        await benchmark(route_count, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--routes", type=int, nargs="+", default=[10, 50, 200, 1000], help="Route counts to run")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests to time for each route count")
+    args = parser.parse_args()
+    asyncio.run(main(args.routes, args.requests))
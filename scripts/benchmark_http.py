@@ -0,0 +1,88 @@
+"""
+Request latency percentiles for /api/ping and the S.M.I.B.H.I.D. sensor ingest route, against a running SMIB.
+
+Run it once per event loop and HTTP parser to compare them, restarting SMIB in between, e.g. with
+SMIB_WEBSERVER_EVENT_LOOP=asyncio SMIB_WEBSERVER_HTTP_PARSER=h11 and then with uvloop and httptools.
+Sensor ingest writes real sensor logs to the database, from the device hostname given.
+
+    uv run python scripts/benchmark_http.py [--url http://localhost] [--requests 2000] [--concurrency 50]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import datetime, UTC
+from http import HTTPStatus
+
+import httpx
+
+from smib.config import webserver
+
+SENSOR_LOG = {
+    "readings": [{
+        "timestamp": 0,
+        "human_timestamp": "",
+        "data": {"BME280": {"pressure": 1020.2, "humidity": 39.55, "temperature": 29}},
+    }],
+    "units": {"BME280": {"pressure": "hPa", "humidity": "%", "temperature": "C"}},
+}
+
+
+def sensor_log() -> dict:
+    now = datetime.now(UTC)
+    reading = SENSOR_LOG["readings"][0] | {"timestamp": int(now.timestamp()),
+                                           "human_timestamp": now.strftime("%Y-%m-%dT%H:%M:%SZ")}
+    return SENSOR_LOG | {"readings": [reading]}
+
+
+async def measure(client: httpx.AsyncClient, request: httpx.Request, latencies: list[float], errors: list[int]) -> None:
+    start = time.perf_counter()
+    response = await client.send(request)
+    latencies.append(time.perf_counter() - start)
+    if response.status_code not in (HTTPStatus.OK, HTTPStatus.CREATED):
+        errors.append(response.status_code)
+
+
+async def benchmark(name: str, client: httpx.AsyncClient, build_request, requests: int, concurrency: int) -> None:
+    latencies: list[float] = []
+    errors: list[int] = []
+    remaining = iter(range(requests))
+
+    async def worker():
+        for _ in remaining:
+            await measure(client, build_request(), latencies, errors)
+
+    # Warm up connections and caches before timing anything
+    for _ in range(concurrency):
+        await client.send(build_request())
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    print(f"{name}: {len(latencies)} requests in {elapsed:.2f}s ({len(latencies) / elapsed:.0f}/s), "
+          f"p50 {quantiles[49] * 1000:.2f}ms p90 {quantiles[89] * 1000:.2f}ms p99 {quantiles[98] * 1000:.2f}ms "
+          f"max {max(latencies) * 1000:.2f}ms, {len(errors)} errors")
+
+
+async def main(url: str, requests: int, concurrency: int, hostname: str) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=30) as client:
+        await benchmark("GET /api/ping", client,
+                        lambda: client.build_request("GET", "/api/ping"),
+                        requests, concurrency)
+        await benchmark("POST /api/smibhid/log/sensor", client,
+                        lambda: client.build_request("POST", "/api/smibhid/log/sensor", json=sensor_log(),
+                                                     headers={"X-SMIBHID-Hostname": hostname}),
+                        requests, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=f"http://localhost:{webserver.port}", help="Base URL of the running SMIB")
+    parser.add_argument("--requests", type=int, default=2000, help="Requests to time per route")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requests in flight at once")
+    parser.add_argument("--hostname", default="SMIBHID-BENCHMARK", help="Device hostname to log sensor readings as")
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.requests, args.concurrency, args.hostname))
@@ -0,0 +1,62 @@
+"""
+Per-request cost of finding the Request argument in a route wrapper's arguments, for handlers with 1, 5 and 20 parameters.
+
+Compares the extractor compiled at decoration time (compile_parameter_extractor) with what every request did before:
+Signature.bind, apply_defaults and a scan of the parameters for the Request annotation. The wrapper is called as FastAPI
+calls it, with every parameter as a keyword argument.
+
+    uv run python scripts/benchmark_parameter_extractor.py [--parameters 1 5 20] [--calls 100000]
+"""
+import argparse
+import timeit
+from inspect import Signature, Parameter
+from typing import Any
+
+from starlette.requests import Request
+
+from smib.events.interfaces import compile_parameter_extractor
+
+
+def extract_parameter_and_value(parameter_annotation: type, signature: Signature, args: tuple[Any, ...], kwargs: dict[str, Any]):
+    """ Request argument extraction before compile_parameter_extractor """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+
+    parameter = next(
+        (param for param in signature.parameters.values() if param.annotation == parameter_annotation),
+        None
+    )
+    return (bound.arguments.get(parameter.name), parameter.name) if parameter else None
+
+
+def create_signature(parameter_count: int) -> Signature:
+    """ A handler signature with the Request last (the longest scan), and the rest query parameters with defaults """
+    parameters = [Parameter(f"query_{number}", Parameter.POSITIONAL_OR_KEYWORD, annotation=str, default="")
+                  for number in range(parameter_count - 1)]
+    parameters.append(Parameter("request", Parameter.KEYWORD_ONLY, annotation=Request))
+    return Signature(parameters)
+
+
+def main(parameter_counts: list[int], calls: int) -> None:
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    for parameter_count in parameter_counts:
+        signature = create_signature(parameter_count)
+        kwargs = {name: (request if parameter.annotation is Request else "value")
+                  for name, parameter in signature.parameters.items()}
+        extractor = compile_parameter_extractor(Request, signature)
+        assert extractor((), kwargs) == extract_parameter_and_value(Request, signature, (), kwargs) == (request, "request")
+
+        per_call = {
+            "bind and scan": min(timeit.repeat(lambda: extract_parameter_and_value(Request, signature, (), kwargs), number=calls, repeat=5)),
+            "compiled": min(timeit.repeat(lambda: extractor((), kwargs), number=calls, repeat=5)),
+        }
+        print(f"{parameter_count:>3} parameters: " + ", ".join(
+            f"{name} {seconds / calls * 1e9:7.0f}ns" for name, seconds in per_call.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--parameters", type=int, nargs="+", default=[1, 5, 20], help="Handler parameter counts to run")
+    parser.add_argument("--calls", type=int, default=100000, help="Calls to time for each parameter count")
+    args = parser.parse_args()
+    main(args.parameters, args.calls)
@@ -0,0 +1,79 @@
+"""
+Manual check of the MongoDB pub/sub backend against a real server (SMIB_DB_* settings, as SMIB itself uses).
+
+Two MongoPubSub instances stand in for two SMIB processes. Both publish at the same time, then go quiet for longer
+than a tailable cursor's await time, then publish again. Every message the other one published must arrive exactly
+once and in order, without a process seeing its own messages twice.
+
+    uv run python scripts/check_mongo_pubsub.py [--messages 200] [--quiet 5]
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+
+from pymongo import AsyncMongoClient
+
+from smib.config import database
+from smib.events.pubsub import MongoPubSub
+
+TOPIC = "pubsub_check"
+
+
+class Process:
+    def __init__(self, name: str, pubsub: MongoPubSub):
+        self.name: str = name
+        self.pubsub: MongoPubSub = pubsub
+        self.received: list[dict] = []
+        self.latencies: list[float] = []
+        pubsub.subscribe(TOPIC, self.on_message)
+
+    def on_message(self, message: dict) -> None:
+        self.received.append(message)
+        if message["from"] != self.name:
+            self.latencies.append(time.time() - message["sent_at"])
+
+    async def publish(self, count: int, start: int = 0) -> None:
+        for n in range(start, start + count):
+            await self.pubsub.publish(TOPIC, {"from": self.name, "n": n, "sent_at": time.time()})
+
+    def check(self, other: "Process", expected: int) -> bool:
+        own = [message["n"] for message in self.received if message["from"] == self.name]
+        others = [message["n"] for message in self.received if message["from"] == other.name]
+        ok = own == list(range(expected)) and others == list(range(expected))
+        latencies = sorted(self.latencies) or [0]
+        print(f"{self.name}: own {len(own)}/{expected}, from {other.name} {len(others)}/{expected} "
+              f"(in order: {others == sorted(others)}), latency p50 {statistics.median(latencies) * 1000:.1f}ms "
+              f"max {latencies[-1] * 1000:.1f}ms -> {'OK' if ok else 'FAILED'}")
+        return ok
+
+
+async def main(messages: int, quiet: float) -> bool:
+    client = AsyncMongoClient(database.mongo_db_uri, tz_aware=True)
+    db = client[database.mongo_db_name]
+    a, b = Process("a", MongoPubSub(db)), Process("b", MongoPubSub(db))
+    followers = [asyncio.create_task(process.pubsub.start()) for process in (a, b)]
+    try:
+        await asyncio.sleep(2)  # Both following
+
+        await asyncio.gather(a.publish(messages), b.publish(messages))
+        # Longer than the cursor's await time, so empty batches come back before the next message
+        await asyncio.sleep(quiet)
+        await asyncio.gather(a.publish(1, messages), b.publish(1, messages))
+        await asyncio.sleep(2)
+
+        return a.check(b, messages + 1) & b.check(a, messages + 1)
+    finally:
+        for follower in followers:
+            follower.cancel()
+        await asyncio.gather(*followers, return_exceptions=True)
+        await client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="Messages each process publishes at once")
+    parser.add_argument("--quiet", type=float, default=5, help="Seconds to publish nothing for before the last message")
+    args = parser.parse_args()
+    sys.exit(0 if asyncio.run(main(args.messages, args.quiet)) else 1)
@@ -10,7 +10,8 @@ from .models import Versions, PingPong
 
 
 def register(api: ApiEventInterface, database: DatabaseManager):
-    @api.get("/version")
+    # The database version only changes on a server upgrade, so it is not worth a round trip on every request
+    @api.get("/version", cache_ttl=3600)
     async def get_version() -> Versions:
         return Versions(
             smib=str(project.version),
@@ -1,3 +1,5 @@
+import hashlib
+import json
 from functools import cache
 from pathlib import Path
 
@@ -18,8 +20,6 @@ templates = Jinja2Templates(directory=Path(__file__).parent / "templates")
 
 def register(database: DatabaseManager, web: WebEventInterface):
 
-    cached_openapi_schema: dict | None = None
-
     @web.get("/database/docs")
     async def get_database_docs(fastapi_request: Request,):
         response = templates.TemplateResponse(
@@ -34,15 +34,14 @@ def register(database: DatabaseManager, web: WebEventInterface):
         )
         return response
 
-    @web.get("/database/openapi.json", response_class=JSONResponse)
+    @web.get("/database/openapi.json", response_class=JSONResponse, validator=lambda _: get_openapi_schema()[1])
     async def get_database_schema():
-        nonlocal cached_openapi_schema
-        if not cached_openapi_schema:
-            cached_openapi_schema = get_openapi_schema()
-        return JSONResponse(cached_openapi_schema)
+        openapi_schema, _ = get_openapi_schema()
+        return JSONResponse(openapi_schema)
 
     @cache
-    def get_openapi_schema():
+    def get_openapi_schema() -> tuple[dict, str]:
+        """ The schema, and the hash conditional requests are validated against, which is built in the same step """
         dummy_app = create_dummy_app()
         models = database.get_all_document_models()
         add_dummy_routes(dummy_app, models)
@@ -60,7 +59,7 @@ def register(database: DatabaseManager, web: WebEventInterface):
         remove_required(openapi)
         add_model_metadata(openapi, models)
 
-        return openapi
+        return openapi, hashlib.sha256(json.dumps(openapi, sort_keys=True).encode()).hexdigest()
 
 
 
@@ -0,0 +1,94 @@
+__display_name__ = "Memory"
+__description__ = "On-demand tracemalloc snapshots and diffs for the running S.M.I.B. process, restricted to localhost"
+__author__ = "Sam Cork"
+
+import asyncio
+import logging
+
+from fastapi import HTTPException, Request, Query, Path
+from pydantic import Field
+
+from smib.config import EnvBaseSettings
+from smib.config.utils import init_plugin_settings
+from smib.events.interfaces.http.http_web_event_interface import WebEventInterface
+from smib.utilities.http import is_direct_local_request
+from smib.memory import MemoryTracker
+from smib.plugins.lifecycle_manager import PluginLifecycleManager
+
+
+class MemoryPluginSettings(EnvBaseSettings):
+    enabled: bool = Field(
+        default=False,
+        description="Whether the /admin/memory endpoints are available (only ever to requests from localhost)"
+    )
+
+    model_config = {
+        "env_prefix": "SMIB_PLUGIN_MEMORY_"
+    }
+
+logger = logging.getLogger(__display_name__)
+config = init_plugin_settings(MemoryPluginSettings, logger)
+
+SNAPSHOT_NAME_PATTERN = r"^[\w.-]{1,64}$"
+
+def register(web: WebEventInterface, plugins: PluginLifecycleManager):
+    if not config.enabled:
+        logger.info("Memory endpoints are disabled")
+        return
+
+    tracker = MemoryTracker(plugins.find_plugin_name_by_path)
+
+    def check_local_request(request: Request):
+        if not is_direct_local_request(request):
+            raise HTTPException(status_code=403, detail="Memory endpoints are only available from localhost")
+
+    @web.get("/admin/memory", include_in_schema=False)
+    async def memory_stats(request: Request):
+        """ Whether tracemalloc is tracing, how much memory it has traced, and the snapshots taken so far """
+        check_local_request(request)
+        return tracker.stats
+
+    @web.post("/admin/memory/start", include_in_schema=False)
+    async def start_tracing(request: Request, frames: int = Query(default=1, ge=1, le=25)):
+        """ Start tracing allocations, keeping this many frames of each allocation's traceback """
+        check_local_request(request)
+        logger.warning(f"Starting tracemalloc with {frames} frame(s), allocations will be slower until it is stopped")
+        tracker.start(frames)
+        return tracker.stats
+
+    @web.post("/admin/memory/stop", include_in_schema=False)
+    async def stop_tracing(request: Request):
+        """ Stop tracing allocations, discarding every snapshot """
+        check_local_request(request)
+        logger.info("Stopping tracemalloc")
+        tracker.stop()
+        return tracker.stats
+
+    @web.post("/admin/memory/snapshots/{name}", include_in_schema=False)
+    async def take_snapshot(request: Request, name: str = Path(pattern=SNAPSHOT_NAME_PATTERN)):
+        """ Take a named snapshot, replacing any snapshot with the same name """
+        check_local_request(request)
+        if not tracker.is_tracing:
+            raise HTTPException(status_code=409, detail="tracemalloc is not tracing, POST /admin/memory/start first")
+
+        # Snapshots of a large heap take a while, so keep them off the event loop
+        snapshot = await asyncio.to_thread(tracker.take_snapshot, name)
+        logger.info(f"Took memory snapshot {name}: {snapshot.traced_bytes} bytes traced")
+        return {"name": snapshot.name, "taken_at": snapshot.taken_at, "traced_bytes": snapshot.traced_bytes}
+
+    @web.get("/admin/memory/diff", include_in_schema=False)
+    async def diff_snapshots(
+        request: Request,
+        old: str = Query(alias="from"),
+        new: str = Query(alias="to"),
+        top: int = Query(default=20, ge=1, le=200),
+    ):
+        """ Allocation growth between two snapshots, by line, by file and by plugin """
+        check_local_request(request)
+        try:
+            diff = await asyncio.to_thread(tracker.diff, old, new, top)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"No snapshot named {e.args[0]}")
+
+        logger.info(f"Memory growth from {old} to {new}: {diff['traced_bytes_diff']} bytes, plugins: {({owner: plugin['size_diff'] for owner, plugin in diff['plugins'].items()})}")
+        return diff
@@ -0,0 +1,76 @@
+__display_name__ = "Profiler"
+__description__ = "On-demand sampling profiler for the running S.M.I.B. process, restricted to localhost"
+__author__ = "Sam Cork"
+
+import asyncio
+import logging
+import threading
+from typing import Literal
+
+from fastapi import HTTPException, Request, Query
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import Field
+
+from smib.config import EnvBaseSettings
+from smib.config.utils import init_plugin_settings
+from smib.events.interfaces.http.http_web_event_interface import WebEventInterface
+from smib.utilities.http import is_direct_local_request
+from smib.plugins.lifecycle_manager import PluginLifecycleManager
+from smib.profiler import SamplingProfiler
+
+
+class ProfilerPluginSettings(EnvBaseSettings):
+    enabled: bool = Field(
+        default=False,
+        description="Whether the /admin/profile endpoint is available (only ever to requests from localhost)"
+    )
+
+    model_config = {
+        "env_prefix": "SMIB_PLUGIN_PROFILER_"
+    }
+
+logger = logging.getLogger(__display_name__)
+config = init_plugin_settings(ProfilerPluginSettings, logger)
+
+MAX_SECONDS = 60
+
+def register(web: WebEventInterface, plugins: PluginLifecycleManager):
+    if not config.enabled:
+        logger.info("Profiler is disabled")
+        return
+
+    # Taken without waiting, so a second request is refused rather than queued behind the running profile
+    profile_lock = threading.Lock()
+
+    @web.post("/admin/profile", include_in_schema=False)
+    async def profile(
+        request: Request,
+        seconds: float = Query(default=10, gt=0, le=MAX_SECONDS),
+        output_format: Literal["summary", "collapsed", "speedscope"] = Query(default="summary", alias="format"),
+    ):
+        """
+        Sample every thread of this process for the given number of seconds.
+        summary: top frames, and samples per plugin
+        collapsed: collapsed stacks, for flamegraph.pl or speedscope
+        speedscope: a speedscope (https://www.speedscope.app) file
+        """
+        if not is_direct_local_request(request):
+            raise HTTPException(status_code=403, detail="Profiling is only available from localhost")
+        if not profile_lock.acquire(blocking=False):
+            raise HTTPException(status_code=409, detail="A profile is already running")
+
+        try:
+            logger.info(f"Profiling for {seconds}s")
+            profiler = SamplingProfiler(plugins.find_plugin_name_by_path)
+            await asyncio.to_thread(profiler.run, seconds)
+        finally:
+            profile_lock.release()
+
+        summary = profiler.summary()
+        logger.info(f"Profile complete: {summary['samples']} samples, plugins: {({owner: plugin['percent'] for owner, plugin in summary['plugins'].items()})}")
+
+        if output_format == "collapsed":
+            return PlainTextResponse(profiler.to_collapsed())
+        if output_format == "speedscope":
+            return JSONResponse(profiler.to_speedscope(), headers={"content-disposition": 'attachment; filename="smib.speedscope.json"'})
+        return JSONResponse(summary)
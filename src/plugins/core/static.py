@@ -2,10 +2,12 @@ __display_name__ = "Static Files"
 __description__ = "Serves static files from the static folder"
 __author__ = "Sam Cork"
 
+import asyncio
 import logging
+from datetime import datetime, UTC
 from pathlib import Path
 
-from fastapi import HTTPException
+from fastapi import HTTPException, Request
 from fastapi.responses import FileResponse
 from pydantic import Field
 
@@ -39,7 +41,19 @@ def register(web: WebEventInterface):
     # TODO (eventually): Replace this with normal StaticFiles mounting.
     #  This is a workaround for FastAPI issue #10180 (https://github.com/fastapi/fastapi/issues/10180).
     #  For additional context, see the related discussion: https://github.com/fastapi/fastapi/discussions/9070.
-    @web.get("/static/{rest_of_path:path}", include_in_schema=False)
+    def get_last_modified(file_path: Path) -> datetime | None:
+        if not file_path.is_file():
+            return None
+        return datetime.fromtimestamp(file_path.stat().st_mtime, UTC)
+
+    async def static_file_last_modified(request: Request) -> datetime | None:
+        rest_of_path: str = request.path_params.get("rest_of_path", "")
+        if not rest_of_path:
+            return None
+        # Filesystem calls block, so they are kept off the event loop
+        return await asyncio.to_thread(get_last_modified, resolved_static_directory_path / rest_of_path)
+
+    @web.get("/static/{rest_of_path:path}", include_in_schema=False, validator=static_file_last_modified)
     async def static_files(rest_of_path: str):
         file_path = resolved_static_directory_path / rest_of_path
         if not rest_of_path or not file_path.exists():
@@ -5,6 +5,8 @@ from beanie import Document, Indexed, before_event, Insert, Replace, Update, Sav
 from pydantic import BaseModel, Field
 import pymongo
 
+from smib.utilities.single_flight import single_flight, copy_model
+
 
 class SpaceLightStateBase(BaseModel):
     light_state: Annotated[
@@ -44,6 +46,7 @@ class SpaceLightState(Document, SpaceLightStateBase):
         self.updated_at = datetime.now(UTC)
 
     @classmethod
+    @single_flight(copy_result=copy_model)
     async def get_latest_state(cls) -> SpaceLightState | None:
         return await cls.find_one(sort=[(cls.updated_at, pymongo.DESCENDING)])
 
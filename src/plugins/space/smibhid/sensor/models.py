@@ -6,6 +6,8 @@ from beanie import Document, Indexed
 from beanie.odm.operators.update.general import Set
 from pydantic import BaseModel, Field, AfterValidator, RootModel
 
+from smib.utilities.single_flight import single_flight, copy_model
+
 from ..common import validate_timestamp
 
 
@@ -140,12 +142,14 @@ class SensorLog(Document, SensorLogBase):
         )
 
     @classmethod
+    @single_flight(copy_result=copy_model)
     async def get_latest_log(cls, /, device: str | None = None) -> Optional["SensorLog"]:
         if device:
             return await cls.find_one(cls.device == device, sort=[(cls.timestamp, pymongo.DESCENDING)])
         return await cls.find_one(sort=[(cls.timestamp, pymongo.DESCENDING)])
 
     @classmethod
+    @single_flight(copy_result=copy_model)
     async def get_latest_log_received(cls) -> Optional["SensorLog"]:
         return await cls.find_one(sort=[(cls.received_timestamp, pymongo.DESCENDING)])
 
@@ -1,22 +1,41 @@
 import logging
-from datetime import timedelta
+from datetime import timedelta, datetime
+from typing import Callable, Awaitable
 
 from slack_bolt.context.say.async_say import AsyncSay
 
+from smib.utilities.single_flight import single_flight, copy_model
+
 from .config import config
 from .models import SpaceState, SpaceStateOpen, SpaceStateEnum, SpaceStateHistory, SpaceStateClosed, SpaceStateSource, \
     SpaceStateEventHistory
 
 logger = logging.getLogger("Space State Plugin - Common")
 
+SpaceStateChangeCallback = Callable[[SpaceState], Awaitable[None]]
+
+_space_state_change_callbacks: list[SpaceStateChangeCallback] = []
+
+def on_space_state_change(callback: SpaceStateChangeCallback) -> SpaceStateChangeCallback:
+    """ Registers a callback for when the space state is changed through SMIB, with the saved SpaceState """
+    _space_state_change_callbacks.append(callback)
+    return callback
+
+async def get_space_state_updated_at() -> datetime | None:
+    """ SpaceState.updated_at as persisted, None if the space state has never been saved """
+    space_state = await get_space_state_from_db()
+    return space_state.updated_at if space_state.id is not None else None
+
+@single_flight(copy_result=copy_model)
 async def get_space_state_from_db() -> SpaceState:
     return await SpaceState.find_one() or SpaceState()
 
-async def set_space_state_in_db(state: SpaceStateEnum) -> None:
+async def set_space_state_in_db(state: SpaceStateEnum) -> SpaceState:
     logger.debug(f"Setting space state to {state} in DB")
-    space_state = await get_space_state_from_db()
+    space_state = await SpaceState.find_one() or SpaceState()
     space_state.open = state == SpaceStateEnum.OPEN
     await space_state.save()
+    return space_state
 
 async def get_space_state_enum_from_db() -> SpaceStateEnum | None:
     state = await get_space_state_from_db()
@@ -50,7 +69,9 @@ async def open_space(space_open_params: SpaceStateOpen, say: AsyncSay, *, source
 
     # Only update the DB if the state has changed
     if old_state is not new_state:
-        await set_space_state_in_db(new_state)
+        space_state = await set_space_state_in_db(new_state)
+        for callback in _space_state_change_callbacks:
+            await callback(space_state)
         await log_to_space_state_history(new_state)
         await inform_websocket_clients_of_space_state_change(new_state)
 
@@ -67,7 +88,9 @@ async def close_space(space_closed_params: SpaceStateClosed, say: AsyncSay, *, s
 
     # Only update the DB if the state has changed
     if old_state is not new_state:
-        await set_space_state_in_db(new_state)
+        space_state = await set_space_state_in_db(new_state)
+        for callback in _space_state_change_callbacks:
+            await callback(space_state)
         await log_to_space_state_history(new_state)
         await inform_websocket_clients_of_space_state_change(new_state)
 
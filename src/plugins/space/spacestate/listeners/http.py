@@ -6,12 +6,20 @@ from fastapi import Body
 from slack_bolt.context.say.async_say import AsyncSay
 
 from smib.events.interfaces.http.http_api_event_interface import ApiEventInterface
-from ..common import get_space_state_from_db, open_space, close_space
+from ..common import get_space_state_from_db, open_space, close_space, get_space_state_updated_at, on_space_state_change
 from ..models import SpaceStateResponse, SpaceState, SpaceStateEnum, SpaceStateOpen, SpaceStateClosed, SpaceStateSource
 
 logger = logging.getLogger("Space State Plugin - HTTP")
 
+# The validator reads updated_at from the database for every request, so a cached response is never served once the
+# space state has changed, even outside SMIB (e.g. in the database UI). This only bounds how long it is kept
+SPACE_STATE_CACHE_TTL_SECONDS: float = 5
+
 def register(api: ApiEventInterface):
+    @on_space_state_change
+    async def evict_cached_space_state(space_state: SpaceState) -> None:
+        """ The cached response is stale from now on in every process, so it is not kept until it expires """
+        await api.invalidate_cache("/space/state")
 
     @api.put("/space/state/open", status_code=HTTPStatus.NO_CONTENT)
     async def set_space_open(
@@ -34,7 +42,8 @@ def register(api: ApiEventInterface):
         await close_space(space_closed_params, say, source=SpaceStateSource.HTTP)
 
 
-    @api.get("/space/state", response_model=SpaceStateResponse)
+    @api.get("/space/state", response_model=SpaceStateResponse, validator=lambda _: get_space_state_updated_at(),
+             cache_ttl=SPACE_STATE_CACHE_TTL_SECONDS, coalesce=True)
     async def get_space_state() -> SpaceState:
         """ Get the space state """
         logger.info("Received space state request.")
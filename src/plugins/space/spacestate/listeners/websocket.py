@@ -1,44 +1,58 @@
 import logging
+import time
 
 from starlette.websockets import WebSocket, WebSocketDisconnect
 
+from smib.events.broadcast import BroadcastHub, OverflowPolicy, Frame
 from smib.events.interfaces.websocket_event_interface import WebsocketEventInterface
 from ..common import get_space_state_from_db
 from ..models import SpaceStateEnum, SpaceStateResponse
 
-clients = set()
 logger = logging.getLogger("Space State Websocket")
 
+# The latest space state frame is sent to new clients without a database read for this long.
+# With the local broadcast backend, changes made by other processes never reach this hub, so it is not kept forever
+SPACE_STATE_FRAME_MAX_AGE_SECONDS = 5
+
+_space_state_hub: BroadcastHub | None = None
+
 def register(ws: WebsocketEventInterface):
+    global _space_state_hub
+    # Only the latest space state matters, so clients falling behind skip straight to it
+    _space_state_hub = ws.broadcast_hub("space_state", overflow=OverflowPolicy.COALESCE, sequence_key="seq")
 
     @ws.websocket('/space/state')
     async def handle_space_state_connections(websocket: WebSocket):
         await websocket.accept()
-        clients.add(websocket)
         logger.info(f"Client connected: {websocket.client.host}")
 
         try:
-            # Send initial state
-            db_state = await get_space_state_from_db()
-            state = SpaceStateResponse(**db_state.model_dump())
-            logger.debug(
-                f"Sending initial space state to client: {websocket.client.host}"
-            )
-            await websocket.send_json(state.model_dump())
-
-            # Listen for messages (or just keep connection alive)
-            while True:
-                try:
-                    await websocket.receive()
-                except WebSocketDisconnect:
-                    break
-                except RuntimeError as e:
-                    # Happens if connection closed unexpectedly
-                    logger.debug(f"Runtime error on receive: {e}")
-                    break
+            async with _space_state_hub.connect(websocket):
+                # Clients reconnecting with ?since=<seq> of the last message they saw are only sent what they missed
+                since = get_since_sequence(websocket)
+                if since is not None and _space_state_hub.resume(websocket, since):
+                    logger.debug(f"Resumed client from sequence {since}: {websocket.client.host}")
+                else:
+                    # Send initial state
+                    logger.debug(
+                        f"Sending initial space state to client: {websocket.client.host}"
+                    )
+                    _space_state_hub.send(websocket, await get_space_state_frame())
+
+                # Listen for messages until the client goes. Heartbeats, idle clients and connection caps are
+                # handled by the websocket interface, so dead connections are noticed here without a broadcast failing
+                while True:
+                    try:
+                        if (await websocket.receive())["type"] == "websocket.disconnect":
+                            break
+                    except WebSocketDisconnect:
+                        break
+                    except RuntimeError as e:
+                        # Happens if connection closed unexpectedly
+                        logger.debug(f"Runtime error on receive: {e}")
+                        break
 
         finally:
-            clients.discard(websocket)
             try:
                 await websocket.close()
             except Exception:
@@ -46,12 +60,29 @@ def register(ws: WebsocketEventInterface):
             logger.debug(f"Cleaned up connection for: {websocket.client.host}")
 
 
+def get_since_sequence(websocket: WebSocket) -> int | None:
+    try:
+        return int(websocket.query_params["since"])
+    except (KeyError, ValueError):
+        return None
+
+
+async def get_space_state_frame() -> Frame:
+    if (frame := _space_state_hub.get_latest_frame(max_age=SPACE_STATE_FRAME_MAX_AGE_SECONDS)) is not None:
+        return frame
+
+    read_at = time.monotonic()
+    db_state = await get_space_state_from_db()
+    # If the state was broadcast while reading it, that newer frame is sent instead
+    return _space_state_hub.retain(SpaceStateResponse(**db_state.model_dump()).model_dump(mode="json"), as_of=read_at)
+
+
 async def inform_websocket_clients_of_space_state_change(new_state: SpaceStateEnum):
+    if _space_state_hub is None:
+        return
+
     state = SpaceStateResponse(open=new_state == SpaceStateEnum.OPEN)
-    for client in clients.copy():
-        try:
-            await client.send_json(state.model_dump())
-            logger.info(f"Sent space state to client: {client.client.host}")
-        except Exception:
-            clients.discard(client)
-            logger.info(f"Client disconnected: {client.client.host}")
\ No newline at end of file
+    # Numbered here and published to every process's hub, where it is encoded once for all of that process's clients.
+    # Only queues the frame, each client is sent it by its own writer task
+    await _space_state_hub.publish(state.model_dump(mode="json"))
+    logger.info(f"Published space state to {len(_space_state_hub)} local client(s)")
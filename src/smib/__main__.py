@@ -1,5 +1,7 @@
 import asyncio
 import logging
+import os
+import socket
 from asyncio import CancelledError
 
 from pymongo.errors import PyMongoError
@@ -7,6 +9,7 @@ from slack_bolt.app.async_app import AsyncApp
 
 from smib.db.manager import DatabaseManager
 from smib.error_handler import slack_bolt_error_handler
+from smib.event_loop import get_event_loop_factory
 from smib.events.handlers.http_event_handler import HttpEventHandler
 from smib.events.handlers.scheduled_event_handler import ScheduledEventHandler
 from smib.events.handlers.websocket_event_handler import WebsocketEventHandler
@@ -14,10 +17,22 @@ from smib.events.interfaces.http.http_api_event_interface import ApiEventInterfa
 from smib.events.interfaces.http.http_web_event_interface import WebEventInterface
 from smib.events.interfaces.scheduled_event_interface import ScheduledEventInterface
 from smib.events.interfaces.websocket_event_interface import WebsocketEventInterface
+from smib.events.middlewares.bolt_middleware import apply_internal_request_middleware_chains
+from smib.events.pubsub import MongoPubSub, create_pubsub
 from smib.events.services import EventServiceManager
+from smib.events.services.event_loop_monitor_service import EventLoopMonitorService
+from smib.events.services.health_service import HealthService
 from smib.events.services.http_event_service import HttpEventService
+from smib.events.services.http_worker_service import HttpWorkerService
+from smib.events.services.metrics_server_service import MetricsServerService
+from smib.events.services.process_metrics_service import ProcessMetricsService
 from smib.events.services.scheduled_event_service import ScheduledEventService
 from smib.events.services.slack_event_service import SlackEventService
+from smib.events.services.tracing_service import TracingService
+from smib.metrics.exposition import mount_metrics_route
+from smib.metrics.slack import create_slack_web_api_session, instrument_slack_listeners
+from smib.tracing import get_tracer
+from smib.tracing.exporters import OtlpJsonFileExporter
 from smib.plugins.integrations.database_plugin_integration import DatabasePluginIntegration
 from smib.plugins.integrations.http_plugin_integration import HttpPluginIntegration
 from smib.plugins.integrations.scheduled_plugin_integration import ScheduledPluginIntegration
@@ -25,15 +40,20 @@ from smib.plugins.integrations.slack_plugin_integration import SlackPluginIntegr
 from smib.plugins.integrations.websocket_plugin_integration import WebsocketPluginIntegration
 from smib.plugins.lifecycle_manager import PluginLifecycleManager
 from smib.plugins.loaders import create_default_plugin_loader
+from smib.process_role import ProcessRole, get_process_role, set_process_role
 from smib.signal_handler import register_signal_handlers, get_shutdown_event
 from smib.utilities.environment import is_running_in_docker
 
 
-async def main():
+async def main(http_sockets: list[socket.socket] | None = None):
     register_signal_handlers()
     shutdown_event = get_shutdown_event()
 
-    from smib.config import project, slack
+    from smib.config import project, slack, webserver, monitoring
+
+    if http_sockets is None and webserver.workers > 1:
+        set_process_role(ProcessRole.LEADER)
+    process_role: ProcessRole = get_process_role()
 
     bolt_app = AsyncApp(
         name=project.display_name,
@@ -44,6 +64,8 @@ async def main():
         logger=logging.getLogger("slack_bolt.AsyncApp")
     )
     bolt_app.error(slack_bolt_error_handler)
+    bolt_app.client.session = create_slack_web_api_session()
+    apply_internal_request_middleware_chains(bolt_app)
 
     logger = logging.getLogger(__name__)
 
@@ -51,11 +73,19 @@ async def main():
 
     logger.info(f"Running in docker: {is_running_in_docker()}")
 
+    logger.info(f"Process role: {process_role}")
+    logger.info(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
+
     # Most of the slack stuff is handled by the SlackBolt Framework
     slack_event_service = SlackEventService(bolt_app)
 
+    database_manager = DatabaseManager()
+
+    # Broadcasts and response cache invalidations are published through the pub/sub backend, which can reach other processes
+    pubsub = create_pubsub(webserver.broadcast_backend, database_manager.client[database_manager.db_name])
+
     # HTTP Service
-    http_event_service = HttpEventService()
+    http_event_service = HttpEventService(sockets=http_sockets, pubsub=pubsub)
     http_event_handler = HttpEventHandler(bolt_app)
 
     http_api_event_interface = ApiEventInterface(bolt_app, http_event_handler, http_event_service)
@@ -63,7 +93,7 @@ async def main():
 
     # Websocket Service
     websocket_event_handler = WebsocketEventHandler(bolt_app)
-    websocket_event_interface = WebsocketEventInterface(bolt_app, websocket_event_handler, http_event_service)
+    websocket_event_interface = WebsocketEventInterface(bolt_app, websocket_event_handler, http_event_service, pubsub)
 
     # Scheduled Job Service
     scheduled_event_service = ScheduledEventService()
@@ -71,12 +101,42 @@ async def main():
     scheduled_event_interface = ScheduledEventInterface(bolt_app, scheduled_event_handler, scheduled_event_service)
 
     # Register Services
+    # Every process registers every plugin, but only the leader talks to Slack and runs jobs
     event_service_manager = EventServiceManager()
-    event_service_manager.register(slack_event_service)
-    event_service_manager.register(http_event_service)
-    event_service_manager.register(scheduled_event_service)
-
-    database_manager = DatabaseManager()
+    if process_role.runs_slack_and_scheduler:
+        event_service_manager.register(slack_event_service)
+    if process_role.serves_http:
+        event_service_manager.register(http_event_service)
+    if process_role == ProcessRole.LEADER:
+        event_service_manager.register(HttpWorkerService(http_event_service, run_http_worker, webserver.workers))
+        # The leader serves nothing on the webserver socket, but its Slack and job metrics still need scraping
+        if monitoring.leader_metrics_port is not None:
+            event_service_manager.register(MetricsServerService(monitoring.leader_metrics_port))
+    if process_role.runs_slack_and_scheduler:
+        event_service_manager.register(scheduled_event_service)
+    if isinstance(pubsub, MongoPubSub):
+        event_service_manager.register(pubsub)
+
+    # Health probes, served by every process that serves HTTP
+    if process_role.serves_http:
+        health_service = HealthService(
+            database_manager,
+            slack_event_service if process_role.runs_slack_and_scheduler else None,
+            scheduled_event_service if process_role.runs_slack_and_scheduler else None,
+        )
+        health_service.mount(http_event_service.fastapi_app)
+        event_service_manager.register(health_service)
+
+    event_service_manager.register(ProcessMetricsService())
+
+    if monitoring.tracing_file is not None:
+        get_tracer().set_exporter(OtlpJsonFileExporter(monitoring.tracing_file, {
+            "service.name": project.name,
+            "service.version": str(project.version),
+            "process.pid": os.getpid(),
+            "smib.process_role": str(process_role),
+        }))
+        event_service_manager.register(TracingService(get_tracer()))
 
     # Plugin Stuff
     plugin_loader = create_default_plugin_loader()
@@ -89,6 +149,7 @@ async def main():
     plugin_lifecycle_manager.register_parameter('schedule', scheduled_event_interface)
     plugin_lifecycle_manager.register_parameter('database', database_manager)
     plugin_lifecycle_manager.register_parameter('ws', websocket_event_interface)
+    plugin_lifecycle_manager.register_parameter('plugins', plugin_lifecycle_manager)
 
     # Plugin integrations
     slack_plugin_integration: SlackPluginIntegration = SlackPluginIntegration(bolt_app)
@@ -115,10 +176,19 @@ async def main():
 
     plugin_lifecycle_manager.load_plugins()
 
+    if monitoring.event_loop_block_threshold is not None:
+        event_loop_monitor_service = EventLoopMonitorService(plugin_lifecycle_manager, monitoring.event_loop_block_threshold)
+        event_service_manager.register(event_loop_monitor_service)
+
     http_api_plugin_integration.finalise_router_setup()
     http_web_plugin_integration.finalise_router_setup()
     websocket_plugin_integration.finalise_router_setup()
 
+    if process_role.runs_slack_and_scheduler:
+        instrument_slack_listeners(bolt_app, plugin_lifecycle_manager)
+    if process_role.serves_http:
+        mount_metrics_route(http_event_service.fastapi_app)
+
     database_manager.register_document_filter(database_plugin_integration.filter_valid_plugins)
 
     try:
@@ -155,8 +225,19 @@ async def main():
     finally:
         # Always unload plugins, regardless of how we got here
         plugin_lifecycle_manager.unload_plugins()
+        await bolt_app.client.session.close()
 
     logger.info("Shutdown complete")
 
+def run(http_sockets: list[socket.socket] | None = None):
+    from smib.config import webserver
+
+    # Everything shares this loop, including the webserver, the Slack socket mode client and the MongoDB client
+    asyncio.run(main(http_sockets=http_sockets), loop_factory=get_event_loop_factory(webserver.event_loop))
+
+def run_http_worker(sockets: list[socket.socket]):
+    set_process_role(ProcessRole.HTTP_WORKER)
+    run(http_sockets=sockets)
+
 if __name__ == '__main__':
-    asyncio.run(main())
+    run()
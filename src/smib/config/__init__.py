@@ -6,6 +6,7 @@ from smib.config.database import DatabaseSettings
 from smib.config.environment import EnvironmentSettings
 from smib.config.general import GeneralSettings
 from smib.config.logging_ import LoggingSettings
+from smib.config.monitoring import MonitoringSettings
 from smib.config.project import ProjectSettings
 from smib.config.slack import SlackSettings
 from smib.config.utils import format_validation_errors, init_settings
@@ -20,6 +21,7 @@ __all__ = [
     "slack",
     "database",
     "webserver",
+    "monitoring",
     "environment",
     "EnvBaseSettings",
     "IntervalField",
@@ -45,6 +47,7 @@ general: GeneralSettings | None = init_settings(GeneralSettings, _collected_erro
 slack: SlackSettings | None = init_settings(SlackSettings, _collected_errors)
 database: DatabaseSettings | None = init_settings(DatabaseSettings, _collected_errors)
 webserver: WebserverSettings | None = init_settings(WebserverSettings, _collected_errors)
+monitoring: MonitoringSettings | None = init_settings(MonitoringSettings, _collected_errors)
 
 if _collected_errors:
     # Log to stderr only to avoid duplicate outputs (some environments route logs to stderr too)
@@ -53,5 +56,5 @@ if _collected_errors:
     # Exit early so the application clearly stops on config errors
     raise SystemExit(1)
 else:
-    for setting in [logging, environment, project, general, slack, database, webserver]:
+    for setting in [logging, environment, project, general, slack, database, webserver, monitoring]:
         _logger.debug(f"{" ".join(split_camel_case(setting.__class__.__name__))} Initialised:\n{setting.model_dump_json(indent=2)}")
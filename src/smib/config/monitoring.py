@@ -0,0 +1,32 @@
+from pathlib import Path
+
+from pydantic import Field
+
+from ._env_base_settings import EnvBaseSettings
+
+
+class MonitoringSettings(EnvBaseSettings):
+    event_loop_block_threshold: float | None = Field(
+        default=0.25,
+        gt=0,
+        description="Seconds the event loop can be blocked by a single callback before it is logged and attributed to the plugin that blocked it. Set to None to disable the event loop monitor"
+    )
+    server_timing: bool = Field(
+        default=False,
+        description="Whether to add a Server-Timing header to HTTP responses, breaking down where the time was spent (also logged at debug level)"
+    )
+    tracing_file: Path | None = Field(
+        default=None,
+        description="File to append trace spans to, as OTLP/JSON (one export request per line). Tracing is off when unset"
+    )
+
+    leader_metrics_port: int | None = Field(
+        default=9464,
+        ge=1,
+        le=65535,
+        description="Port the leader serves its own /metrics on when there are HTTP workers (Slack listeners, scheduled jobs, Slack Web API and their MongoDB calls). None to not serve them"
+    )
+
+    model_config = {
+        "env_prefix": "SMIB_MONITORING_"
+    }
@@ -1,4 +1,6 @@
-from pydantic import Field
+from typing import Literal
+
+from pydantic import Field, field_validator, model_validator
 
 from ._env_base_settings import EnvBaseSettings
 from ._env_base_settings import EnvBaseSettings
@@ -25,6 +27,75 @@ class WebserverSettings(EnvBaseSettings):
         default=False,
         description="Whether to log detailed information about HTTP requests"
     )
+    workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of HTTP worker processes. Above 1, a leader process runs Slack and the scheduler and the workers share its socket"
+    )
+
+    broadcast_backend: Literal["local", "mongodb"] = Field(
+        default="local",
+        description="Pub/sub backend WebSocket broadcasts are published through. local only reaches this process's clients, mongodb reaches every process sharing the database, and must be chosen to run workers"
+    )
+    websocket_ping_interval: float | None = Field(
+        default=20,
+        gt=0,
+        description="Seconds between the pings sent to every WebSocket client. Set to None to disable heartbeats"
+    )
+    websocket_ping_timeout: float | None = Field(
+        default=20,
+        gt=0,
+        description="Seconds a WebSocket client has to answer a ping before its connection is closed as dead"
+    )
+    websocket_idle_timeout: float | None = Field(
+        default=None,
+        gt=0,
+        description="Seconds a WebSocket client can go without sending a message (pongs do not count) before it is disconnected. None never disconnects idle clients"
+    )
+    websocket_max_connections: int | None = Field(
+        default=1000,
+        ge=1,
+        description="Maximum WebSocket connections per process, further connections are closed with 1013 (try again later). None for no limit"
+    )
+    websocket_max_connections_per_client: int | None = Field(
+        default=20,
+        ge=1,
+        description="Maximum WebSocket connections per process from one remote address, further connections are closed with 1013 (try again later). None for no limit"
+    )
+    websocket_max_message_size: int = Field(
+        default=64 * 1024,
+        ge=1,
+        description="Largest message in bytes a WebSocket client can send, larger messages close the connection"
+    )
+
+    compression_minimum_size: int | None = Field(
+        default=1024,
+        ge=0,
+        description="Minimum response size in bytes before it is compressed (gzip, plus brotli/zstd where available). Set to None to disable compression"
+    )
+    event_loop: Literal["auto", "asyncio", "uvloop"] = Field(
+        default="auto",
+        description="Event loop implementation for the whole process (auto uses uvloop when installed)"
+    )
+    http_parser: Literal["auto", "h11", "httptools"] = Field(
+        default="auto",
+        description="HTTP/1.1 parser implementation for the webserver (auto uses httptools when installed)"
+    )
+
+    @field_validator("event_loop", "http_parser", "broadcast_backend", mode="before")
+    @classmethod
+    def normalize_implementation(cls, v: str) -> str:
+        if isinstance(v, str):
+            return v.lower()
+        return v
+
+    @model_validator(mode="after")
+    def check_broadcast_backend(self) -> "WebserverSettings":
+        # With workers, state changes made by the leader (e.g. from Slack) must reach the workers' WebSocket clients.
+        # The mongodb backend is opted into rather than picked for workers, until it has been proven in a real deployment
+        if self.broadcast_backend == "local" and self.workers > 1:
+            raise ValueError("broadcast_backend 'local' cannot reach WebSocket clients on other workers, set it to 'mongodb' when workers is above 1")
+        return self
 
     model_config = {
         "env_prefix": "SMIB_WEBSERVER_"
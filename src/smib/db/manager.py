@@ -8,6 +8,8 @@ from pymongo import AsyncMongoClient
 from pymongo.errors import PyMongoError
 
 from smib.config import database
+from smib.metrics.mongo import MongoCommandMetricsListener
+from smib.tracing.mongo import MongoCommandTracingListener
 from smib.utilities.package import get_actual_module_name, get_module_from_name
 
 T = TypeVar('T', bound=Any)
@@ -26,7 +28,7 @@ def filter_not_beanie(model: type[Document]) -> bool:
 class DatabaseManager:
     def __init__(self, db_name: str = database.mongo_db_name) -> None:
         self.db_name: str = db_name
-        self.client: AsyncMongoClient = AsyncMongoClient(database.mongo_db_uri, tz_aware=True)
+        self.client: AsyncMongoClient = AsyncMongoClient(database.mongo_db_uri, tz_aware=True, event_listeners=[MongoCommandMetricsListener(), MongoCommandTracingListener()])
         self.logger: Logger = logging.getLogger(self.__class__.__name__)
         self._document_filters: list[Callable[[type[Document]], bool]] = []
 
@@ -72,6 +74,9 @@ class DatabaseManager:
             None,
         )
 
+    async def ping(self) -> None:
+        await self.client.admin.command('ping')
+
     async def get_db_version(self) -> str:
         info = await self.client.server_info()
         return info['version']
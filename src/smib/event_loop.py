@@ -0,0 +1,19 @@
+import asyncio
+import logging
+from typing import Callable
+
+from smib.utilities.package import is_package_installed
+
+
+def get_event_loop_factory(event_loop: str) -> Callable[[], asyncio.AbstractEventLoop] | None:
+    """Get the loop factory for asyncio.run, None meaning the default asyncio event loop."""
+    if event_loop == "asyncio":
+        return None
+
+    if not is_package_installed("uvloop"):
+        if event_loop == "uvloop":
+            logging.getLogger(__name__).warning("uvloop event loop requested but uvloop is not installed, falling back to asyncio")
+        return None
+
+    import uvloop
+    return uvloop.new_event_loop
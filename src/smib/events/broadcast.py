@@ -0,0 +1,287 @@
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import StrEnum
+from logging import Logger
+from typing import Any, AsyncIterator, TypeAlias
+
+from starlette import status
+from starlette.websockets import WebSocket
+
+from smib.events.pubsub import PubSub
+from smib.metrics import get_metrics_registry
+
+BROADCAST_CLIENTS = get_metrics_registry().gauge(
+    "smib_websocket_broadcast_clients", "WebSocket clients subscribed to a broadcast hub", ("hub",))
+BROADCAST_MESSAGES = get_metrics_registry().counter(
+    "smib_websocket_broadcast_messages", "Messages broadcast by a broadcast hub", ("hub",))
+BROADCAST_COALESCED = get_metrics_registry().counter(
+    "smib_websocket_broadcast_coalesced", "Queued messages discarded in favour of a newer one, for clients falling behind", ("hub",))
+BROADCAST_DROPPED_CLIENTS = get_metrics_registry().counter(
+    "smib_websocket_broadcast_dropped_clients", "Clients disconnected by a broadcast hub, by reason", ("hub", "reason"))
+BROADCAST_RESUMES = get_metrics_registry().counter(
+    "smib_websocket_broadcast_resumes", "Clients asking to resume from a sequence, by whether the history could replay it", ("hub", "outcome"))
+
+
+# A message as sent over the websocket: text frames for str, binary frames for bytes.
+# Both are immutable, so one frame is queued for every client as is
+Frame: TypeAlias = str | bytes
+
+
+def encode_frame(message: Any) -> Frame:
+    """ Frames are sent as they are, anything else is JSON encoded (as WebSocket.send_json would) """
+    if isinstance(message, (str, bytes)):
+        return message
+    return json.dumps(message, separators=(",", ":"), ensure_ascii=False)
+
+
+class OverflowPolicy(StrEnum):
+    # Disconnect a client whose queue is full
+    DROP_CLIENT = 'drop_client'
+    # Discard everything a client has queued, and queue only the newest message (for state that supersedes itself)
+    COALESCE = 'coalesce'
+
+
+class BroadcastClient:
+    """ A subscribed websocket, with its outbound queue and the task writing it out """
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket: WebSocket = websocket
+        self.queue: asyncio.Queue[Frame] = asyncio.Queue(queue_size)
+        self.writer: asyncio.Task | None = None
+
+    def coalesce(self, frame: Frame) -> None:
+        while not self.queue.empty():
+            self.queue.get_nowait()
+        self.queue.put_nowait(frame)
+
+
+class BroadcastHub:
+    """
+    Fans messages out to a set of websockets without the broadcaster ever waiting on them.
+
+    Each client gets a bounded queue drained by its own writer task, so broadcast() only has to queue the message and
+    returns straight away. A client that cannot keep up is dealt with by the overflow policy, and one that takes longer
+    than send_timeout to accept a message is disconnected, so no client can hold up any other.
+
+    Messages are encoded into a frame once, however many clients they go to. The latest frame broadcast is kept, so
+    clients connecting later can be sent the current state without it being fetched and encoded again.
+
+    Every broadcast is numbered, and the last history_size frames are kept, so a reconnecting client can resume from the
+    last sequence it saw and be sent only what it missed. With sequence_key set, the sequence is added to every dict
+    message under that key. Sequences start from the hub's creation time in microseconds, so they keep increasing across
+    restarts, and a sequence from before a restart is never mistaken for one of this hub's.
+
+    broadcast() only reaches the clients of this process. publish() goes through the pub/sub backend the hub is
+    subscribed to, so with a backend shared between processes it reaches every process's clients. Published messages
+    are numbered once, by the publishing process, and carry their sequence through the backend, so the same hub in every
+    process numbers them alike and a client can resume from a sequence it was sent by any of them.
+    """
+    DEFAULT_QUEUE_SIZE: int = 16
+    DEFAULT_SEND_TIMEOUT: float = 10
+    DEFAULT_HISTORY_SIZE: int = 16
+
+    def __init__(self, name: str, *, queue_size: int = DEFAULT_QUEUE_SIZE, send_timeout: float = DEFAULT_SEND_TIMEOUT,
+                 overflow: OverflowPolicy = OverflowPolicy.DROP_CLIENT, history_size: int = DEFAULT_HISTORY_SIZE,
+                 sequence_key: str | None = None, pubsub: PubSub | None = None):
+        self.name: str = name
+        self.queue_size: int = queue_size
+        self.send_timeout: float = send_timeout
+        self.overflow: OverflowPolicy = overflow
+        self.pubsub: PubSub | None = pubsub
+        self.sequence_key: str | None = sequence_key
+        self.logger: Logger = logging.getLogger(f"{self.__class__.__name__}[{name}]")
+
+        self.sequence: int = time.time_ns() // 1000
+        self.history: deque[tuple[int, Frame]] = deque(maxlen=history_size)
+        # Sequences are not contiguous, so the last one dropped from the history is where replays can start from
+        self._replayable_since: int = self.sequence
+        self.clients: dict[WebSocket, BroadcastClient] = {}
+        self.latest_frame: Frame | None = None
+        self._latest_frame_at: float = 0
+        self._closing_tasks: set[asyncio.Task] = set()
+
+        self._clients_gauge = BROADCAST_CLIENTS.labels(name)
+        self._messages_counter = BROADCAST_MESSAGES.labels(name)
+        self._coalesced_counter = BROADCAST_COALESCED.labels(name)
+
+        if pubsub is not None:
+            pubsub.subscribe(name, self.on_published)
+
+    def __len__(self) -> int:
+        return len(self.clients)
+
+    def subscribe(self, websocket: WebSocket) -> BroadcastClient:
+        """ Starts sending broadcasts to an accepted websocket, until it is unsubscribed """
+        if (client := self.clients.get(websocket)) is not None:
+            return client
+
+        client = BroadcastClient(websocket, self.queue_size)
+        client.writer = asyncio.create_task(self.write(client), name=f"{self.name} writer")
+        self.clients[websocket] = client
+        self._clients_gauge.set(len(self.clients))
+        return client
+
+    def unsubscribe(self, websocket: WebSocket) -> None:
+        if (client := self.clients.pop(websocket, None)) is None:
+            return
+        if client.writer is not None and client.writer is not asyncio.current_task():
+            client.writer.cancel()
+        self._clients_gauge.set(len(self.clients))
+
+    @asynccontextmanager
+    async def connect(self, websocket: WebSocket) -> AsyncIterator[BroadcastClient]:
+        """ Subscribes an accepted websocket for the duration of the block """
+        client = self.subscribe(websocket)
+        try:
+            yield client
+        finally:
+            self.unsubscribe(websocket)
+
+    def retain(self, message: Any, *, as_of: float | None = None) -> Frame:
+        """
+        Keeps a message as the latest frame without broadcasting it, e.g. the current state read from the database,
+        and returns the latest frame.
+        as_of: time.monotonic() when the message was read. If a frame was broadcast since, that one is kept (and returned)
+        """
+        as_of = time.monotonic() if as_of is None else as_of
+        if as_of >= self._latest_frame_at:
+            # The state as of the latest broadcast, so clients sent it resume from there
+            self.latest_frame, self._latest_frame_at = encode_frame(self.with_sequence(message, self.sequence)), as_of
+        return self.latest_frame
+
+    def with_sequence(self, message: Any, sequence: int) -> Any:
+        if self.sequence_key is None or not isinstance(message, dict):
+            return message
+        return {**message, self.sequence_key: sequence}
+
+    def get_latest_frame(self, max_age: float | None = None) -> Frame | None:
+        """ The latest frame broadcast or retained, unless it is older than max_age seconds """
+        if max_age is not None and time.monotonic() - self._latest_frame_at > max_age:
+            return None
+        return self.latest_frame
+
+    def send(self, websocket: WebSocket, message: Any) -> bool:
+        """ Queues a message for one subscribed client, returning whether it was queued """
+        if (client := self.clients.get(websocket)) is None:
+            return False
+        return self._enqueue(client, encode_frame(message))
+
+    def broadcast(self, message: Any, *, sequence: int | None = None) -> int:
+        """
+        Queues a message for every subscribed client, returning how many it was queued for.
+        sequence: The sequence publish() gave the message, defaults to the next one of this hub
+        """
+        self._messages_counter.inc()
+        if sequence is not None and sequence <= self.sequence:
+            # Published by two processes at once, and delivered here in the other order
+            self.logger.debug(f"Sequence {sequence} arrived after {self.sequence}, renumbering it")
+            sequence = None
+        self.sequence = self.sequence + 1 if sequence is None else sequence
+
+        frame = encode_frame(self.with_sequence(message, self.sequence))
+        if len(self.history) == self.history.maxlen:
+            self._replayable_since = self.history[0][0]
+        self.history.append((self.sequence, frame))
+        self.latest_frame, self._latest_frame_at = frame, time.monotonic()
+        return sum(self._enqueue(client, frame) for client in list(self.clients.values()))
+
+    async def publish(self, message: Any) -> None:
+        """ Broadcasts a message to this hub in every process subscribed to the pub/sub backend, this one included """
+        if self.pubsub is None:
+            self.broadcast(message)
+            return
+
+        # Ahead of every sequence this process has seen, and of the clock, so another process publishing at the same
+        # time (before either has seen the other's message) is all but certain to pick a different sequence
+        sequence = max(self.sequence + 1, time.time_ns() // 1000)
+        await self.pubsub.publish(self.name, {"sequence": sequence, "message": message})
+
+    def on_published(self, published: dict[str, Any]) -> None:
+        """ Subscriber to the hub's topic on the pub/sub backend """
+        self.broadcast(published["message"], sequence=published["sequence"])
+
+    def replay(self, since: int) -> list[Frame] | None:
+        """ The frames broadcast after sequence since, or None if they are not all in the history any more (or never were) """
+        if since == self.sequence:
+            return []
+        if not self.history or not self._replayable_since <= since < self.sequence:
+            return None
+        return [frame for sequence, frame in self.history if sequence > since]
+
+    def resume(self, websocket: WebSocket, since: int) -> bool:
+        """
+        Queues everything broadcast after sequence since for a subscribed client, returning False if that is not possible
+        and the client needs sending the current state instead. Subscribe first, so nothing is broadcast in between.
+        """
+        if websocket not in self.clients or (frames := self.replay(since)) is None:
+            BROADCAST_RESUMES.labels(self.name, "full").inc()
+            return False
+
+        BROADCAST_RESUMES.labels(self.name, "replayed").inc()
+        for frame in frames:
+            self.send(websocket, frame)
+        return True
+
+    def _enqueue(self, client: BroadcastClient, frame: Frame) -> bool:
+        try:
+            client.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if self.overflow is OverflowPolicy.COALESCE:
+            self._coalesced_counter.inc(client.queue.qsize())
+            client.coalesce(frame)
+            return True
+
+        self.drop(client, "queue_full")
+        return False
+
+    def drop(self, client: BroadcastClient, reason: str) -> None:
+        """ Unsubscribes and closes a client that is not keeping up """
+        self.logger.info(f"Disconnecting {client.websocket.client.host if client.websocket.client else 'unknown client'}: {reason}")
+        BROADCAST_DROPPED_CLIENTS.labels(self.name, reason).inc()
+        self.unsubscribe(client.websocket)
+
+        closing_task = asyncio.create_task(self.close_websocket(client.websocket))
+        self._closing_tasks.add(closing_task)
+        closing_task.add_done_callback(self._closing_tasks.discard)
+
+    async def close_websocket(self, websocket: WebSocket) -> None:
+        try:
+            await asyncio.wait_for(websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="Too slow"), self.send_timeout)
+        except Exception:
+            pass  # Already closed, or too far gone to close cleanly
+
+    @staticmethod
+    async def send_frame(websocket: WebSocket, frame: Frame) -> None:
+        if isinstance(frame, bytes):
+            await websocket.send_bytes(frame)
+        else:
+            await websocket.send_text(frame)
+
+    async def write(self, client: BroadcastClient) -> None:
+        while True:
+            frame = await client.queue.get()
+            try:
+                await asyncio.wait_for(self.send_frame(client.websocket, frame), self.send_timeout)
+            except TimeoutError:
+                self.drop(client, "send_timeout")
+                return
+            except Exception as e:
+                # The client has gone, whoever is handling its connection will notice and unsubscribe it
+                self.logger.debug(f"Failed to send to client, unsubscribing: {repr(e)}")
+                self.unsubscribe(client.websocket)
+                return
+
+    async def close(self) -> None:
+        """ Stops every writer task, leaving the websockets themselves to their handlers """
+        writers = [client.writer for client in self.clients.values() if client.writer is not None]
+        for websocket in list(self.clients):
+            self.unsubscribe(websocket)
+        if writers or self._closing_tasks:
+            await asyncio.gather(*writers, *self._closing_tasks, return_exceptions=True)
@@ -0,0 +1,102 @@
+from collections import defaultdict
+from collections.abc import Iterator, Iterable
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from slack_bolt import BoltResponse
+from slack_bolt.app.async_app import AsyncApp
+from slack_bolt.listener.async_listener import AsyncListener
+from slack_bolt.request.async_request import AsyncBoltRequest
+
+from smib.events import BoltEventType
+from smib.tracing import start_span
+
+# (event kind, listener key) of the request currently being dispatched by SMIB.
+# Left unset for requests Bolt receives on its own (i.e. Slack socket mode), which select the Slack listeners.
+_current_dispatch: ContextVar[tuple[BoltEventType | None, str | None]] = ContextVar("current_dispatch", default=(None, None))
+# (event kind, listener key) that listeners created right now belong to, see bind_listeners().
+# Left unset for listeners registered any other way, which are Slack listeners.
+_current_binding: ContextVar[tuple[BoltEventType, str] | None] = ContextVar("current_binding", default=None)
+
+
+class ListenerRegistry(list):
+    """
+    Drop-in replacement for AsyncApp._async_listeners.
+
+    The list itself still holds every listener in registration order, so len, slicing and remove behave as Bolt and
+    SlackPluginIntegration.disconnect_listeners expect. Iterating it - which is how Bolt finds candidate listeners -
+    only yields the listeners registered for the event kind (and listener key) currently being dispatched.
+    """
+
+    def __init__(self, listeners: Iterable[AsyncListener] = ()):
+        super().__init__(listeners)
+        self._slack_listeners: list[AsyncListener] = list(super().__iter__())
+        self._keyed_listeners: dict[BoltEventType, dict[str, list[AsyncListener]]] = defaultdict(lambda: defaultdict(list))
+        self._bindings: dict[AsyncListener, tuple[BoltEventType, str]] = {}
+
+    def append(self, listener: AsyncListener) -> None:
+        super().append(listener)
+        if (binding := _current_binding.get()) is None:
+            self._slack_listeners.append(listener)
+            return
+
+        kind, key = binding
+        self._keyed_listeners[kind][key].append(listener)
+        self._bindings[listener] = binding
+
+    def remove(self, listener: AsyncListener) -> None:
+        super().remove(listener)
+        if listener in self._bindings:
+            kind, key = self._bindings.pop(listener)
+            keyed_listeners = self._keyed_listeners[kind][key]
+            keyed_listeners.remove(listener)
+            if not keyed_listeners:
+                del self._keyed_listeners[kind][key]
+        else:
+            self._slack_listeners.remove(listener)
+
+    @property
+    def slack_listeners(self) -> tuple[AsyncListener, ...]:
+        return tuple(self._slack_listeners)
+
+    def __iter__(self) -> Iterator[AsyncListener]:
+        kind, key = _current_dispatch.get()
+        if kind is None:
+            return iter(self._slack_listeners)
+
+        keyed_listeners = self._keyed_listeners.get(kind)
+        if keyed_listeners is None:
+            return iter(())
+        return iter(keyed_listeners.get(key, ()))
+
+
+def get_listener_registry(bolt_app: AsyncApp) -> ListenerRegistry:
+    if not isinstance(bolt_app._async_listeners, ListenerRegistry):
+        bolt_app._async_listeners = ListenerRegistry(bolt_app._async_listeners)
+    return bolt_app._async_listeners
+
+
+@contextmanager
+def bind_listeners(bolt_app: AsyncApp, kind: BoltEventType, key: str) -> Iterator[None]:
+    """
+    Puts the listeners Bolt creates inside the block into the kind/key table, as it appends them, rather than with the
+    Slack listeners
+    """
+    get_listener_registry(bolt_app)
+    token = _current_binding.set((kind, key))
+    try:
+        yield
+    finally:
+        _current_binding.reset(token)
+
+
+async def dispatch(bolt_app: AsyncApp, request: AsyncBoltRequest, kind: BoltEventType, key: str) -> BoltResponse:
+    get_listener_registry(bolt_app)
+    token = _current_dispatch.set((kind, key))
+    try:
+        with start_span(f"dispatch {kind}", attributes={"smib.listener_key": key}) as span:
+            response = await bolt_app.async_dispatch(request)
+            span.set_attribute("smib.bolt_response.status", response.status)
+            return response
+    finally:
+        _current_dispatch.reset(token)
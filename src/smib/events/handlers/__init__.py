@@ -1,8 +1,6 @@
 from enum import StrEnum
 
-from slack_sdk.signature import SignatureVerifier
-
-from smib.config import slack
+from slack_bolt.request.async_request import AsyncBoltRequest
 
 
 class BoltRequestMode(StrEnum):
@@ -11,11 +9,39 @@ class BoltRequestMode(StrEnum):
     SCHEDULED = 'scheduled'
     WEBSOCKET = 'websocket'
 
-def get_slack_signature_headers(body: str | bytes) -> dict[str, str]:
-    verifier = SignatureVerifier(slack.signing_secret.get_secret_value())
-    timestamp = str(int(verifier.clock.now()))
-    headers = {
-        "x-slack-request-timestamp": timestamp,
-        "x-slack-signature": verifier.generate_signature(timestamp=timestamp, body=body)
-    }
-    return headers
\ No newline at end of file
+
+INTERNAL_REQUEST_MODES: frozenset[BoltRequestMode] = frozenset({
+    BoltRequestMode.HTTP,
+    BoltRequestMode.SCHEDULED,
+    BoltRequestMode.WEBSOCKET,
+})
+
+INTERNAL_REQUEST_CONTEXT_KEY = "smib_internal_request"
+
+
+class _InternalRequestMarker:
+    """
+    Marks a Bolt request as built by SMIB in this process.
+    Trust is based on object identity, so nothing received from Slack or over HTTP can forge it.
+    """
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        # Lazy listeners receive a deep copy of the request context, the marker must survive it
+        return self
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}>"
+
+
+_INTERNAL_REQUEST_MARKER = _InternalRequestMarker()
+
+
+def mark_internal_request(context: dict) -> dict:
+    return {**context, INTERNAL_REQUEST_CONTEXT_KEY: _INTERNAL_REQUEST_MARKER}
+
+
+def is_internal_request(request: AsyncBoltRequest) -> bool:
+    return request.mode in INTERNAL_REQUEST_MODES and request.context.get(INTERNAL_REQUEST_CONTEXT_KEY) is _INTERNAL_REQUEST_MARKER
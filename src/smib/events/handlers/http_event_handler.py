@@ -1,40 +1,45 @@
-import json
 from http import HTTPMethod
 from typing import Any
 
 from fastapi import Request, Response
-from fastapi.encoders import jsonable_encoder
 from slack_bolt import BoltResponse
 from slack_bolt.adapter.starlette.async_handler import to_starlette_response
 from slack_bolt.app.async_app import AsyncApp
 from slack_bolt.request.async_request import AsyncBoltRequest
 
 from smib.events import BoltEventType
-from smib.events.handlers import BoltRequestMode, get_slack_signature_headers
+from smib.events.dispatcher import dispatch
+from smib.events.handlers import BoltRequestMode, mark_internal_request
 from smib.events.responses.http_bolt_response import HttpBoltResponse
+from smib.metrics.server_timing import timing_span
 
 
 class HttpEventHandler:
     def __init__(self, bolt_app: AsyncApp):
         self.bolt_app: AsyncApp = bolt_app
 
-    async def handle(self, request: Request, context: dict):
-        bolt_request: AsyncBoltRequest = await to_async_bolt_request(request, context)
-        bolt_response: BoltResponse | HttpBoltResponse = await self.bolt_app.async_dispatch(bolt_request)
+    async def handle(self, request: Request, context: dict, listener_key: str):
+        with timing_span("bolt-request"):
+            bolt_request: AsyncBoltRequest = await to_async_bolt_request(request, context, listener_key)
+        with timing_span("dispatch"):
+            bolt_response: BoltResponse | HttpBoltResponse = await dispatch(self.bolt_app, bolt_request, BoltEventType.HTTP, listener_key)
         return await to_http_response(bolt_response)
 
-async def to_async_bolt_request(request: Request, context: dict) -> AsyncBoltRequest:
+async def to_async_bolt_request(request: Request, context: dict, listener_key: str) -> AsyncBoltRequest:
+    # The body is handed to Bolt as a dict so it is never JSON encoded and re-parsed.
+    # The live request itself travels in the context (see HttpEventInterface._route_decorator).
     request_body: dict[str, Any] = {
         "type": "event_callback",
         "event": {
             "type": BoltEventType.HTTP,
+            "listener_key": listener_key,
             "request": {
                 "method": HTTPMethod(request.method),
                 "scheme": request.url.scheme,
                 "url": str(request.url),
                 "path": str(request.url.path),
                 "query_string": request.url.query,
-                "query_params": jsonable_encoder(request.query_params),
+                "query_params": dict(request.query_params),
                 "scope": {
                     "type": request.scope["type"],
                     "method": request.scope["method"],
@@ -46,10 +51,7 @@ async def to_async_bolt_request(request: Request, context: dict) -> AsyncBoltReq
         }
     }
 
-    json_body = json.dumps(request_body)
-    headers = dict(request.headers) | get_slack_signature_headers(json_body)
-
-    return AsyncBoltRequest(body=json_body, query=dict(request.query_params), headers=headers, mode=BoltRequestMode.HTTP, context=context)
+    return AsyncBoltRequest(body=request_body, query=dict(request.query_params), headers=dict(request.headers), mode=BoltRequestMode.HTTP, context=mark_internal_request(context))
 
 async def to_http_response(response: BoltResponse) -> tuple[Response, dict]:
 
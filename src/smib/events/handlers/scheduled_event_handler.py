@@ -1,12 +1,12 @@
-import json
-
 from apscheduler.job import Job
 from slack_bolt import BoltResponse
 from slack_bolt.app.async_app import AsyncApp
 from slack_bolt.request.async_request import AsyncBoltRequest
 
 from smib.events import BoltEventType
-from smib.events.handlers import BoltRequestMode, get_slack_signature_headers
+from smib.events.dispatcher import dispatch
+from smib.events.handlers import BoltRequestMode, mark_internal_request
+from smib.tracing import StatusCode, start_span
 
 
 class ScheduledEventHandler:
@@ -14,9 +14,12 @@ class ScheduledEventHandler:
         self.bolt_app: AsyncApp = bolt_app
 
     async def handle(self, job: Job):
-        bolt_request: AsyncBoltRequest = await to_async_bolt_request(job)
-        bolt_response: BoltResponse = await self.bolt_app.async_dispatch(bolt_request)
-        return bolt_response
+        with start_span(f"job {job.id}", attributes={"smib.job.id": job.id, "smib.job.name": job.name}) as span:
+            bolt_request: AsyncBoltRequest = await to_async_bolt_request(job)
+            bolt_response: BoltResponse = await dispatch(self.bolt_app, bolt_request, BoltEventType.SCHEDULED, job.id)
+            if bolt_response.status >= 500:
+                span.set_status(StatusCode.ERROR, f"Bolt response {bolt_response.status}")
+            return bolt_response
 
 async def to_async_bolt_request(job: Job) -> AsyncBoltRequest:
     body = {
@@ -34,7 +37,4 @@ async def to_async_bolt_request(job: Job) -> AsyncBoltRequest:
 
     context: dict = {"job": job}
 
-    json_body = json.dumps(body)
-    headers = get_slack_signature_headers(json_body)
-
-    return AsyncBoltRequest(body=json_body, mode=BoltRequestMode.SCHEDULED, context=context, headers=headers)
\ No newline at end of file
+    return AsyncBoltRequest(body=body, mode=BoltRequestMode.SCHEDULED, context=mark_internal_request(context))
\ No newline at end of file
@@ -1,4 +1,3 @@
-import json
 from typing import Any
 
 from slack_bolt import BoltResponse
@@ -7,22 +6,24 @@ from slack_bolt.request.async_request import AsyncBoltRequest
 from starlette.websockets import WebSocket
 
 from smib.events import BoltEventType
-from smib.events.handlers import get_slack_signature_headers, BoltRequestMode
+from smib.events.dispatcher import dispatch
+from smib.events.handlers import BoltRequestMode, mark_internal_request
 
 
 class WebsocketEventHandler:
     def __init__(self, bolt_app: AsyncApp):
         self.bolt_app = bolt_app
 
-    async def handle(self, websocket: WebSocket, context: dict):
-        bolt_request: AsyncBoltRequest = await to_async_bolt_request(websocket, context)
-        _: BoltResponse = await self.bolt_app.async_dispatch(bolt_request)
+    async def handle(self, websocket: WebSocket, context: dict, listener_key: str):
+        bolt_request: AsyncBoltRequest = await to_async_bolt_request(websocket, context, listener_key)
+        _: BoltResponse = await dispatch(self.bolt_app, bolt_request, BoltEventType.WEBSOCKET, listener_key)
 
-async def to_async_bolt_request(websocket: WebSocket, context: dict) -> AsyncBoltRequest:
+async def to_async_bolt_request(websocket: WebSocket, context: dict, listener_key: str) -> AsyncBoltRequest:
     request_body: dict[str, Any] = {
         "type": "event_callback",
         "event": {
             "type": BoltEventType.WEBSOCKET,
+            "listener_key": listener_key,
             "request": {
                 "scope": {
                     "type": websocket.scope["type"],
@@ -34,7 +35,5 @@ async def to_async_bolt_request(websocket: WebSocket, context: dict) -> AsyncBol
         }
     }
 
-    json_body = json.dumps(request_body)
-    headers = dict(websocket.headers) | get_slack_signature_headers(json_body)
-    return AsyncBoltRequest(body=json_body, query=dict(websocket.query_params), headers=headers, mode=BoltRequestMode.WEBSOCKET, context=context)
+    return AsyncBoltRequest(body=request_body, query=dict(websocket.query_params), headers=dict(websocket.headers), mode=BoltRequestMode.WEBSOCKET, context=mark_internal_request(context))
 
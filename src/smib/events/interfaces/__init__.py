@@ -1,5 +1,6 @@
+import uuid
 from inspect import Signature, Parameter
-from typing import TypeVar, Any
+from typing import TypeVar, Any, Callable, Awaitable
 
 from slack_bolt.kwargs_injection.async_args import AsyncArgs
 
@@ -9,19 +10,48 @@ def get_reserved_parameter_names() -> set[str]:
 
 ParameterType_ = TypeVar("ParameterType_")
 
-def extract_parameter_and_value(parameter_annotation: type[ParameterType_], signature: Signature, args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[ParameterType_, str] | None:
-    bound = signature.bind(*args, **kwargs)
-    bound.apply_defaults()
+ParameterExtractor = Callable[[tuple[Any, ...], dict[str, Any]], tuple[ParameterType_, str]]
 
-    parameter = next(
-        (param for param in signature.parameters.values() if param.annotation == parameter_annotation),
-        None
-    )
-    return (bound.arguments.get(parameter.name), parameter.name) if parameter else None
+def compile_parameter_extractor(parameter_annotation: type[ParameterType_], signature: Signature) -> ParameterExtractor | None:
+    """
+    Resolves the annotated parameter's name, position and default once, when the handler is decorated.
+    The returned extractor is then a plain dict lookup per call, falling back to the positional argument or default.
+    """
+    parameter = find_annotation_in_signature(parameter_annotation, signature)
+    if parameter is None:
+        return None
+
+    name: str = parameter.name
+    position: int | None = None
+    if parameter.kind in (Parameter.POSITIONAL_ONLY, Parameter.POSITIONAL_OR_KEYWORD):
+        position = list(signature.parameters).index(name)
+    default: Any = None if parameter.default is Parameter.empty else parameter.default
+
+    def extractor(args: tuple[Any, ...], kwargs: dict[str, Any]) -> tuple[ParameterType_, str]:
+        if name in kwargs:
+            return kwargs[name], name
+        if position is not None and position < len(args):
+            return args[position], name
+        return default, name
+
+    return extractor
 
 def find_annotation_in_signature(parameter_annotation: type[Any], signature: Signature) -> Parameter | None:
     parameter = next(
         (param for param in signature.parameters.values() if param.annotation == parameter_annotation),
         None
     )
-    return parameter
\ No newline at end of file
+    return parameter
+
+def generate_listener_key() -> str:
+    return uuid.uuid4().hex
+
+def generate_listener_key_matcher(listener_key: str) -> Callable[[dict], Awaitable[bool]]:
+    """
+    Starlette has already resolved the request to a route (and so to its endpoint wrapper) by the time Bolt is invoked.
+    The wrapper passes its listener key through in the event, so matching is a single comparison per listener.
+    """
+    async def matcher(event: dict) -> bool:
+        return event['listener_key'] == listener_key
+
+    return matcher
@@ -2,7 +2,7 @@ import logging
 from functools import wraps
 from http import HTTPStatus
 from inspect import Signature, Parameter
-from typing import Callable, Any
+from typing import Callable, Any, Hashable
 
 import makefun
 from fastapi import Request
@@ -11,14 +11,27 @@ from makefun import remove_signature_parameters, add_signature_parameters
 from slack_bolt.app.async_app import AsyncApp
 from slack_bolt.kwargs_injection.async_args import AsyncArgs
 from starlette.responses import JSONResponse, Response
-from starlette.routing import Match, BaseRoute
 
 from smib.events import BoltEventType
+from smib.events.dispatcher import bind_listeners
 from smib.events.handlers.http_event_handler import HttpEventHandler
-from smib.events.interfaces import get_reserved_parameter_names, extract_parameter_and_value
+from smib.events.interfaces import get_reserved_parameter_names, generate_listener_key, generate_listener_key_matcher, \
+    compile_parameter_extractor, ParameterExtractor
 from smib.events.requests.copyable_starlette_request import CopyableStarletteRequest
 from smib.events.responses.http_bolt_response import HttpBoltResponse
+from smib.events.routes import create_api_route_class, Validator, CacheKey, ResponseCache
 from smib.events.services.http_event_service import HttpEventService
+from smib.metrics import get_metrics_registry, get_plugin_label
+from smib.metrics.server_timing import timing_span
+from smib.tracing import start_span
+
+# Requests that never change anything, so their responses can be reused
+SAFE_METHODS: frozenset[str] = frozenset({"GET", "HEAD"})
+
+HTTP_REQUESTS_IN_PROGRESS = get_metrics_registry().gauge(
+    "smib_http_requests_in_progress", "HTTP requests currently being handled", ("plugin", "route", "method"))
+HTTP_REQUEST_DURATION = get_metrics_registry().histogram(
+    "smib_http_request_duration_seconds", "Time taken to handle HTTP requests, including the Bolt dispatch", ("plugin", "route", "method"))
 
 
 class HttpEventInterface:
@@ -70,7 +83,32 @@ class HttpEventInterface:
             return func
         return decorator
 
-    def _route_decorator(self, path: str, methods: list, *args, **kwargs):
+    async def invalidate_cache(self, path: str, key: Hashable | None = None):
+        """
+        Evict cached responses of the route registered at path (as passed to the decorator), in every process sharing
+        the pub/sub backend. This process's cache is cleared before it returns.
+        key: One cached response (as returned by the route's cache_key) rather than all of them. Must be made of str, int
+        and tuples to reach other processes
+        """
+        await self.service.pubsub.publish(ResponseCache.INVALIDATION_TOPIC, {"route_path": self.path_prefix + path, "key": key})
+
+    def _route_decorator(self, path: str, methods: list, *args, compress: bool = True, validator: Validator | None = None,
+                         cache_ttl: float | None = None, cache_key: CacheKey | None = None, coalesce: bool = False, **kwargs):
+        """
+        compress: Set to False to never compress this route's responses
+        validator: See ApiEventInterface.get()
+        cache_ttl: Seconds to serve this route's responses from the in-process response cache, skipping the handler (GET/HEAD only)
+        cache_key: Callable taking the request, returning what cached and coalesced responses are keyed on (defaults to the path and query string)
+        coalesce: Set to True to run the handler once for concurrent identical requests, sharing its response (GET/HEAD only)
+        """
+        # Neither looks at the request body, and skipping the handler of a request that changes something would lose the change
+        if (cache_ttl is not None or coalesce) and not set(method.upper() for method in methods) <= SAFE_METHODS:
+            raise ValueError(f"cache_ttl and coalesce are only for GET/HEAD routes, not {', '.join(methods)} {path}")
+        route_class = create_api_route_class(validator=validator, response_cache=self.service.response_cache,
+                                             cache_ttl=cache_ttl, cache_key=cache_key, coalesce=coalesce)
+        if route_class is not None:
+            kwargs["route_class_override"] = route_class
+
         def decorator(*funcs: list[Callable], ack: Callable | None = None, lazy: list[Callable] | None = None):
             if funcs and len(funcs) > 1:
                 raise TypeError("Only 1 function may be passed to the decorator")
@@ -81,6 +119,11 @@ class HttpEventInterface:
 
             func = ack or funcs[0]
             http_function_signature: Signature = clean_signature(Signature.from_callable(func))
+            extract_request_parameter: ParameterExtractor = compile_request_parameter_extractor(http_function_signature)
+            listener_key: str = generate_listener_key()
+            metric_labels: tuple[str, ...] = (get_plugin_label(), self.path_prefix + path, ",".join(methods))
+            requests_in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(*metric_labels)
+            request_duration = HTTP_REQUEST_DURATION.labels(*metric_labels)
 
             @makefun.with_signature(http_function_signature,
                                     func_name=func.__name__,
@@ -89,22 +132,23 @@ class HttpEventInterface:
                                     )
             @wraps(func)
             async def wrapper(*wrapper_args: list[Any], **wrapper_kwargs: dict[str, Any]):
-                request_value, request_parameter_name = extract_request_parameter(http_function_signature, wrapper_args,
-                                                                                  wrapper_kwargs)
+                request_value, request_parameter_name = extract_request_parameter(wrapper_args, wrapper_kwargs)
 
                 # Enforce a copyable request object
                 # TODO - This needs proper testing
                 request_value = CopyableStarletteRequest(request_value)
                 wrapper_kwargs[request_parameter_name] = request_value
 
-                response, response_kwargs = await self.handler.handle(request_value, wrapper_kwargs)
+                with requests_in_progress.track_in_progress(), request_duration.time():
+                    response, response_kwargs = await self.handler.handle(request_value, wrapper_kwargs, listener_key)
                 wrapper_kwargs.update(response_kwargs)
                 return response
 
             self.current_router.add_api_route(path, wrapper, *args, methods=methods, **{**self.add_api_route_options, **kwargs})
-            route: BaseRoute = self.current_router.routes[-1]
+            if not compress:
+                self.service.uncompressed_endpoints.add(wrapper)
 
-            matcher: callable = generate_route_matcher(route)
+            matcher: callable = generate_listener_key_matcher(listener_key)
             response_preserving_func = preserve_http_response(func)
 
             args_: list
@@ -115,7 +159,8 @@ class HttpEventInterface:
             else:
                 args_ = [response_preserving_func]
                 lazy_kwargs = {}
-            self.bolt_app.event(BoltEventType.HTTP, matchers=[matcher])(*args_, **lazy_kwargs)
+            with bind_listeners(self.bolt_app, BoltEventType.HTTP, listener_key):
+                self.bolt_app.event(BoltEventType.HTTP, matchers=[matcher])(*args_, **lazy_kwargs)
             return func
 
         return decorator
@@ -125,21 +170,13 @@ class HttpEventInterface:
 def preserve_http_response(func: callable) -> callable:
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        response = await func(*args, **kwargs)
+        with timing_span("listener"), start_span(f"listener {func.__qualname__}"):
+            response = await func(*args, **kwargs)
         return HttpBoltResponse(status=0, body='', fastapi_response=response, fastapi_kwargs=kwargs)
     return wrapper
 
-def generate_route_matcher(route: BaseRoute) -> callable:
-    async def matcher(event: dict) -> bool:
-        match_result = route.matches(event['request']['scope'])
-        match = Match(match_result[0])
-        return match == Match.FULL
-
-    return matcher
-
-
-def extract_request_parameter(signature: Signature, args, kwargs) -> tuple[Request, str]:
-    return extract_parameter_and_value(Request, signature, args, kwargs)
+def compile_request_parameter_extractor(signature: Signature) -> ParameterExtractor:
+    return compile_parameter_extractor(Request, signature)
 
 
 def clean_signature(signature: Signature) -> Signature:
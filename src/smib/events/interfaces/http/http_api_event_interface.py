@@ -2,6 +2,7 @@ from slack_bolt.app.async_app import AsyncApp
 
 from smib.events.handlers.http_event_handler import HttpEventHandler
 from smib.events.interfaces.http import HttpEventInterface
+from smib.events.routes import Validator
 from smib.events.services.http_event_service import HttpEventService
 
 
@@ -9,9 +10,14 @@ class ApiEventInterface(HttpEventInterface):
     def __init__(self, bolt_app: AsyncApp, handler: HttpEventHandler, service: HttpEventService):
         super().__init__(bolt_app, handler, service, path_prefix='/api')
 
-    def get(self, path: str, *args, **kwargs):
-        """ See fastapi.FastAPI.get() for parameters """
-        return self._route_decorator(path, ["GET"], *args, **kwargs)
+    def get(self, path: str, *args, validator: Validator | None = None, **kwargs):
+        """
+        See fastapi.FastAPI.get() for parameters
+
+        validator: Optional callable (sync or async) taking the request and returning a version string or last modified
+            datetime. Conditional requests that still match it are answered with 304 Not Modified without running the handler.
+        """
+        return self._route_decorator(path, ["GET"], *args, validator=validator, **kwargs)
 
     def put(self, path: str, *args, **kwargs):
         """ See fastapi.FastAPI.put() for parameters """
@@ -3,6 +3,7 @@ from starlette.responses import HTMLResponse
 
 from smib.events.handlers.http_event_handler import HttpEventHandler
 from smib.events.interfaces.http import HttpEventInterface
+from smib.events.routes import Validator
 from smib.events.services.http_event_service import HttpEventService
 
 
@@ -10,6 +11,11 @@ class WebEventInterface(HttpEventInterface):
     def __init__(self, bolt_app: AsyncApp, handler: HttpEventHandler, service: HttpEventService):
         super().__init__(bolt_app, handler, service, include_in_schema=False, default_response_class=HTMLResponse)
 
-    def get(self, path: str, *args, **kwargs):
-        """ See fastapi.FastAPI.get() for parameters """
-        return self._route_decorator(path, ["GET"], *args, **kwargs)
\ No newline at end of file
+    def get(self, path: str, *args, validator: Validator | None = None, **kwargs):
+        """
+        See fastapi.FastAPI.get() for parameters
+
+        validator: Optional callable (sync or async) taking the request and returning a version string or last modified
+            datetime. Conditional requests that still match it are answered with 304 Not Modified without running the handler.
+        """
+        return self._route_decorator(path, ["GET"], *args, validator=validator, **kwargs)
\ No newline at end of file
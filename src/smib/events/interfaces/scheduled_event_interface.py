@@ -1,16 +1,29 @@
 import logging
+import time
 import uuid
 from asyncio import CancelledError
+from datetime import datetime, UTC
 from functools import wraps
 
 import unicodedata
+from apscheduler.events import JobSubmissionEvent, EVENT_JOB_SUBMITTED
 from apscheduler.job import Job
 from apscheduler.util import undefined
 from slack_bolt.app.async_app import AsyncApp
 
+from smib.events import BoltEventType
+from smib.events.dispatcher import bind_listeners
 from smib.events.handlers import BoltRequestMode
 from smib.events.handlers.scheduled_event_handler import ScheduledEventHandler
 from smib.events.services.scheduled_event_service import ScheduledEventService
+from smib.metrics import get_metrics_registry, get_plugin_label
+
+SCHEDULED_JOB_RUNS = get_metrics_registry().counter(
+    "smib_scheduled_job_runs", "Scheduled job runs, by outcome (success, error or cancelled)", ("plugin", "job", "outcome"))
+SCHEDULED_JOB_DURATION = get_metrics_registry().histogram(
+    "smib_scheduled_job_duration_seconds", "Time taken to run scheduled jobs, including the Bolt dispatch", ("plugin", "job"))
+SCHEDULED_JOB_LATENESS = get_metrics_registry().histogram(
+    "smib_scheduled_job_lateness_seconds", "Time between when scheduled jobs were due and when they started", ("plugin", "job"))
 
 
 class ScheduledEventInterface:
@@ -21,6 +34,13 @@ class ScheduledEventInterface:
 
         self.logger = logging.getLogger(self.__class__.__name__)
 
+        self.scheduled_run_times: dict[str, datetime] = {}
+        self.service.scheduler.add_listener(self.record_scheduled_run_time, EVENT_JOB_SUBMITTED)
+
+    def record_scheduled_run_time(self, event: JobSubmissionEvent):
+        # Submission happens before the job's coroutine starts, so the wrapper can tell how late it is
+        self.scheduled_run_times[event.job_id] = event.scheduled_run_times[-1]
+
     def job(
             self,
             trigger,
@@ -42,19 +62,38 @@ class ScheduledEventInterface:
             normalised_name = unicodedata.normalize('NFKD', func.__name__.replace('_', ' ').title()).encode('ascii', 'ignore').decode('utf-8')
             name = name or func.__doc__ or normalised_name
 
+            plugin_label: str = get_plugin_label()
+            job_duration = SCHEDULED_JOB_DURATION.labels(plugin_label, id)
+            job_lateness = SCHEDULED_JOB_LATENESS.labels(plugin_label, id)
+
             @wraps(func)
             async def wrapper():
                 job: Job = self.service.scheduler.get_job(id)
+                if (scheduled_run_time := self.scheduled_run_times.pop(id, None)) is not None:
+                    job_lateness.observe(max((datetime.now(UTC) - scheduled_run_time).total_seconds(), 0))
+
+                outcome = "success"
+                start = time.perf_counter()
                 try:
-                    await self.handler.handle(job)
+                    bolt_response = await self.handler.handle(job)
+                    if bolt_response.status >= 500:
+                        outcome = "error"
                 except (KeyboardInterrupt, CancelledError, SystemExit) as e:
+                    outcome = "cancelled"
                     self.logger.info(f"Scheduled job \"{job}\" received termination: {repr(e)}")
+                except Exception:
+                    outcome = "error"
+                    raise
+                finally:
+                    job_duration.observe(time.perf_counter() - start)
+                    SCHEDULED_JOB_RUNS.labels(plugin_label, id, outcome).inc()
 
             self.service.scheduler.add_job(wrapper, trigger, id=id, name=name, misfire_grace_time=misfire_grace_time, coalesce=coalesce, max_instances=max_instances, next_run_time=next_run_time, **trigger_args)
             async def matcher(event: dict):
                 return event['job']['id'] == id
 
-            self.bolt_app.event(BoltRequestMode.SCHEDULED, matchers=[matcher])(func)
+            with bind_listeners(self.bolt_app, BoltEventType.SCHEDULED, id):
+                self.bolt_app.event(BoltRequestMode.SCHEDULED, matchers=[matcher])(func)
             return func
         return decorator
 
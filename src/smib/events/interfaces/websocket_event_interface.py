@@ -1,40 +1,107 @@
+import asyncio
 import logging
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
 from functools import wraps
 from inspect import Signature
-from typing import Callable, Any
+from typing import Callable, Any, AsyncIterator
 
 import makefun
 from fastapi import APIRouter
 from makefun import remove_signature_parameters
 from slack_bolt.app.async_app import AsyncApp
+from starlette import status
 from starlette.routing import BaseRoute
-from starlette.websockets import WebSocket
+from starlette.types import Message
+from starlette.websockets import WebSocket, WebSocketState
 
+from smib.config import webserver
 from smib.events import BoltEventType
+from smib.events.broadcast import BroadcastHub
+from smib.events.dispatcher import bind_listeners
+from smib.events.pubsub import PubSub
 from smib.events.handlers.websocket_event_handler import WebsocketEventHandler
-from smib.events.interfaces import get_reserved_parameter_names, extract_parameter_and_value, \
-    find_annotation_in_signature
-from smib.events.interfaces.http import generate_route_matcher
+from smib.events.interfaces import get_reserved_parameter_names, generate_listener_key, \
+    generate_listener_key_matcher, compile_parameter_extractor, ParameterExtractor
 from smib.events.services.http_event_service import HttpEventService
+from smib.metrics import get_metrics_registry, get_plugin_label
+
+WEBSOCKET_CONNECTIONS = get_metrics_registry().gauge(
+    "smib_websocket_connections", "WebSocket connections currently open", ("plugin", "route"))
+WEBSOCKET_CONNECTION_DURATION = get_metrics_registry().histogram(
+    "smib_websocket_connection_duration_seconds", "How long WebSocket connections stay open", ("plugin", "route"),
+    buckets=(1, 10, 60, 300, 900, 1800, 3600, 14400, 86400))
+WEBSOCKET_CLIENT_ADDRESSES = get_metrics_registry().gauge(
+    "smib_websocket_client_addresses", "Remote addresses with a WebSocket connection currently open")
+WEBSOCKET_SERVER_CLOSED_CONNECTIONS = get_metrics_registry().counter(
+    "smib_websocket_server_closed_connections", "WebSocket connections closed by the server, by reason", ("plugin", "route", "reason"))
 
 
 class WebsocketEventInterface:
-    def __init__(self, bolt_app: AsyncApp, handler: WebsocketEventHandler, service: HttpEventService):
+    def __init__(self, bolt_app: AsyncApp, handler: WebsocketEventHandler, service: HttpEventService, pubsub: PubSub | None = None):
         self.bolt_app = bolt_app
         self.handler = handler
         self.service = service
+        self.pubsub: PubSub = pubsub or PubSub()
 
         self.logger = logging.getLogger(self.__class__.__name__)
         self.path_prefix = '/ws'
 
         self.routers: dict[str, APIRouter] = {}
         self.current_router: APIRouter = APIRouter(include_in_schema=False)
+        self.broadcast_hubs: dict[str, BroadcastHub] = {}
+
+        # Open connections across every route, capped so misbehaving clients cannot exhaust memory or file descriptors
+        self.connection_count: int = 0
+        self.connections_per_client: Counter[str] = Counter()
+
+    def broadcast_hub(self, name: str, **kwargs) -> BroadcastHub:
+        """
+        The broadcast hub with this name, created with kwargs (see BroadcastHub) the first time it is asked for.
+        Handlers subscribe their accepted websockets to it, and anything can then broadcast to all of them without waiting.
+        The hub is subscribed to the pub/sub backend, so what is published to it reaches the hub of the same name in every process.
+        """
+        if (hub := self.broadcast_hubs.get(name)) is None:
+            hub = self.broadcast_hubs[name] = BroadcastHub(name, pubsub=self.pubsub, **kwargs)
+        return hub
+
+    def get_capped_reason(self, client_host: str) -> str | None:
+        """ Why a new connection from client_host would go over a connection cap, or None if it would not """
+        if webserver.websocket_max_connections is not None and self.connection_count >= webserver.websocket_max_connections:
+            return "max_connections"
+        if webserver.websocket_max_connections_per_client is not None and \
+                self.connections_per_client[client_host] >= webserver.websocket_max_connections_per_client:
+            return "max_connections_per_client"
+        return None
+
+    @asynccontextmanager
+    async def track_connection(self, client_host: str) -> AsyncIterator[None]:
+        self.connection_count += 1
+        self.connections_per_client[client_host] += 1
+        WEBSOCKET_CLIENT_ADDRESSES.labels().set(len(self.connections_per_client))
+        try:
+            yield
+        finally:
+            self.connection_count -= 1
+            self.connections_per_client[client_host] -= 1
+            if self.connections_per_client[client_host] <= 0:
+                del self.connections_per_client[client_host]
+            WEBSOCKET_CLIENT_ADDRESSES.labels().set(len(self.connections_per_client))
 
     def websocket(self, path: str, name: str | None = None, **kwargs):
         def decorator(func: Callable):
             websocket_function_signature: Signature = clean_signature(Signature.from_callable(func))
-            if find_annotation_in_signature(WebSocket, websocket_function_signature) is None:
+            extract_websocket_parameter: ParameterExtractor | None = compile_websocket_parameter_extractor(websocket_function_signature)
+            if extract_websocket_parameter is None:
                 raise ValueError("Parameter with type WebSocket not found in handler signature")
+            listener_key: str = generate_listener_key()
+            metric_labels: tuple[str, ...] = (get_plugin_label(), self.path_prefix + path)
+            connections = WEBSOCKET_CONNECTIONS.labels(*metric_labels)
+            connection_duration = WEBSOCKET_CONNECTION_DURATION.labels(*metric_labels)
+
+            def count_server_closed(reason: str) -> None:
+                WEBSOCKET_SERVER_CLOSED_CONNECTIONS.labels(*metric_labels, reason).inc()
 
             @makefun.with_signature(websocket_function_signature,
                                     func_name=func.__name__,
@@ -43,26 +110,77 @@ class WebsocketEventInterface:
                                     )
             @wraps(func)
             async def wrapper(*wrapper_args: list[Any], **wrapper_kwargs: dict[str, Any]):
-                websocket_parameter_value, websocket_parameter_name = extract_websocket_parameter(websocket_function_signature, wrapper_args, wrapper_kwargs)
+                websocket_parameter_value, websocket_parameter_name = extract_websocket_parameter(wrapper_args, wrapper_kwargs)
                 self.logger.debug(f"Handling WebSocket connection from {websocket_parameter_value.client} on path {websocket_parameter_value.scope['path']}")
-                await self.handler.handle(websocket_parameter_value, wrapper_kwargs)
+
+                client_host: str = websocket_parameter_value.client.host if websocket_parameter_value.client else "unknown"
+                if (capped_reason := self.get_capped_reason(client_host)) is not None:
+                    self.logger.warning(f"Refusing WebSocket connection from {client_host} on path {websocket_parameter_value.scope['path']}: {capped_reason}")
+                    count_server_closed(capped_reason)
+                    # Accepted first so the client gets the close code, rather than a bare HTTP 403
+                    await websocket_parameter_value.accept()
+                    await websocket_parameter_value.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="Too many connections")
+                    return
+
+                with connections.track_in_progress(), connection_duration.time():
+                    async with self.track_connection(client_host), \
+                            close_when_idle(websocket_parameter_value, webserver.websocket_idle_timeout, count_server_closed):
+                        await self.handler.handle(websocket_parameter_value, wrapper_kwargs, listener_key)
 
             self.current_router.add_api_websocket_route(path, wrapper, name, **kwargs)
             route: BaseRoute = self.current_router.routes[-1]
             self.logger.debug(f"Added WebSocket route: {route.path}")
 
-            matcher: Callable = generate_route_matcher(route)
-            self.bolt_app.event(BoltEventType.WEBSOCKET, matchers=[matcher])(func)
+            matcher: Callable = generate_listener_key_matcher(listener_key)
+            with bind_listeners(self.bolt_app, BoltEventType.WEBSOCKET, listener_key):
+                self.bolt_app.event(BoltEventType.WEBSOCKET, matchers=[matcher])(func)
 
             return func
         return decorator
 
 
+@asynccontextmanager
+async def close_when_idle(websocket: WebSocket, idle_timeout: float | None, on_close: Callable[[str], None]) -> AsyncIterator[None]:
+    """
+    Closes the websocket once the client has sent nothing for idle_timeout seconds, which wakes the handler's receive().
+    Only messages the handler receives count as activity, pongs to the server's heartbeat pings are handled by uvicorn.
+    """
+    if idle_timeout is None:
+        yield
+        return
+
+    last_received: float = time.monotonic()
+    receive = websocket.receive
+
+    async def receive_and_record() -> Message:
+        nonlocal last_received
+        message = await receive()
+        last_received = time.monotonic()
+        return message
+
+    async def close_once_idle() -> None:
+        while (idle := time.monotonic() - last_received) < idle_timeout:
+            await asyncio.sleep(idle_timeout - idle)
+        if websocket.application_state == WebSocketState.CONNECTED:
+            on_close("idle")
+            try:
+                await websocket.close(code=status.WS_1001_GOING_AWAY, reason="Idle")
+            except Exception:
+                pass  # Already gone, the handler will notice
+
+    websocket.receive = receive_and_record
+    watchdog = asyncio.create_task(close_once_idle())
+    try:
+        yield
+    finally:
+        watchdog.cancel()
+
+
 def clean_signature(signature: Signature) -> Signature:
     reserved_parameters: set[str] = get_reserved_parameter_names()
     parameters_to_remove: set[str] = reserved_parameters.intersection(signature.parameters.keys())
     cleaned_signature: Signature = remove_signature_parameters(signature, *parameters_to_remove)
     return cleaned_signature
 
-def extract_websocket_parameter(signature: Signature, args, kwargs) -> tuple[WebSocket, str]:
-    return extract_parameter_and_value(WebSocket, signature, args, kwargs)
\ No newline at end of file
+def compile_websocket_parameter_extractor(signature: Signature) -> ParameterExtractor | None:
+    return compile_parameter_extractor(WebSocket, signature)
\ No newline at end of file
@@ -0,0 +1,50 @@
+import logging
+from typing import Callable, Awaitable
+
+from slack_bolt import BoltResponse
+from slack_bolt.app.async_app import AsyncApp
+from slack_bolt.middleware.async_builtins import AsyncSslCheck, AsyncRequestVerification, AsyncIgnoringSelfEvents, \
+    AsyncUrlVerification
+from slack_bolt.middleware.async_middleware import AsyncMiddleware
+from slack_bolt.request.async_request import AsyncBoltRequest
+
+from smib.events.handlers import is_internal_request
+
+# Built-in Bolt middleware that only applies to requests from Slack, skipped for every request built by SMIB
+# (HTTP, scheduled and websocket alike). Anything not listed here (authorization, custom plugin middleware, ...)
+# still runs for every request.
+SLACK_ONLY_MIDDLEWARE: tuple[type[AsyncMiddleware], ...] = (
+    AsyncSslCheck,
+    AsyncRequestVerification,
+    AsyncIgnoringSelfEvents,
+    AsyncUrlVerification,
+)
+
+
+class InternalRequestBypassMiddleware(AsyncMiddleware):
+    """ Runs the wrapped Slack-only middleware, unless the request was built by SMIB """
+
+    def __init__(self, middleware: AsyncMiddleware):
+        self.middleware: AsyncMiddleware = middleware
+
+    async def async_process(self, *, req: AsyncBoltRequest, resp: BoltResponse,
+                            next: Callable[[], Awaitable[BoltResponse]]) -> BoltResponse | None:
+        if is_internal_request(req):
+            return await next()
+        return await self.middleware.async_process(req=req, resp=resp, next=next)
+
+    @property
+    def name(self) -> str:
+        return self.middleware.name
+
+
+def apply_internal_request_middleware_chains(bolt_app: AsyncApp) -> None:
+    logger = logging.getLogger(__name__)
+    middleware_list: list[AsyncMiddleware] = bolt_app._async_middleware_list
+
+    for index, middleware in enumerate(middleware_list):
+        if not isinstance(middleware, SLACK_ONLY_MIDDLEWARE):
+            continue
+
+        logger.debug(f"Bypassing {middleware.name} for internal requests")
+        middleware_list[index] = InternalRequestBypassMiddleware(middleware)
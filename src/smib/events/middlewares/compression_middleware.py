@@ -0,0 +1,245 @@
+import hashlib
+import logging
+import zlib
+from collections import OrderedDict
+from typing import Callable, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+
+    def finish(self) -> bytes: ...
+
+
+class GzipCompressor:
+    def __init__(self):
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliCompressor:
+    def __init__(self):
+        import brotli
+        self._compressor = brotli.Compressor(quality=5)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdCompressor:
+    def __init__(self):
+        from compression import zstd
+        self._compressor = zstd.ZstdCompressor(level=3)
+        self._flush_block = zstd.ZstdCompressor.FLUSH_BLOCK
+        self._flush_frame = zstd.ZstdCompressor.FLUSH_FRAME
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data, mode=self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(mode=self._flush_frame)
+
+
+def get_available_compressors() -> dict[str, Callable[[], Compressor]]:
+    """ Supported content encodings in order of server preference """
+    compressors: dict[str, Callable[[], Compressor]] = {}
+    try:
+        from compression import zstd
+        compressors["zstd"] = ZstdCompressor
+    except ImportError:
+        pass
+    try:
+        import brotli
+        compressors["br"] = BrotliCompressor
+    except ImportError:
+        pass
+    compressors["gzip"] = GzipCompressor
+    return compressors
+
+
+def parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    encodings: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        encoding, _, parameters = item.strip().partition(";")
+        if not encoding:
+            continue
+        quality = 1.0
+        for parameter in parameters.split(";"):
+            name, _, value = parameter.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        encodings[encoding.strip().lower()] = quality
+    return encodings
+
+
+class CompressionMiddleware:
+    """
+    Compresses responses with the best content encoding the client accepts (zstd, br, gzip).
+
+    Responses smaller than the minimum size, already encoded, of an incompressible content type, or from an endpoint
+    that opted out are sent as is. Compressed single-chunk bodies are cached by content digest, so payloads that do not
+    change (e.g. the OpenAPI schemas) are only compressed once.
+    """
+
+    COMPRESSIBLE_CONTENT_TYPES = (
+        "text/",
+        "application/json",
+        "application/javascript",
+        "application/xml",
+        "image/svg+xml",
+    )
+    COMPRESSIBLE_CONTENT_TYPE_SUFFIXES = ("+json", "+xml")
+
+    CACHE_MAX_ENTRIES = 32
+    CACHE_MAX_BODY_BYTES = 4 * 1024 * 1024
+
+    def __init__(self, app: ASGIApp, minimum_size: int, excluded_endpoints: set[Callable]):
+        self.app: ASGIApp = app
+        self.minimum_size: int = minimum_size
+        self.excluded_endpoints: set[Callable] = excluded_endpoints
+        self.compressors: dict[str, Callable[[], Compressor]] = get_available_compressors()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.logger.debug(f"Available content encodings: {', '.join(self.compressors)}")
+
+        self._cache: OrderedDict[tuple[str, bytes], bytes] = OrderedDict()
+
+    def select_encoding(self, headers: Headers) -> str | None:
+        accepted = parse_accept_encoding(headers.get("accept-encoding", ""))
+        wildcard_quality = accepted.get("*", 0.0)
+        best_encoding, best_quality = None, 0.0
+        for encoding in self.compressors:
+            quality = accepted.get(encoding, wildcard_quality)
+            if quality > best_quality:
+                best_encoding, best_quality = encoding, quality
+        return best_encoding
+
+    def is_compressible(self, headers: Headers) -> bool:
+        if "content-encoding" in headers:
+            return False
+        content_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return content_type.startswith(self.COMPRESSIBLE_CONTENT_TYPES) or content_type.endswith(self.COMPRESSIBLE_CONTENT_TYPE_SUFFIXES)
+
+    def is_below_minimum_size(self, headers: Headers) -> bool:
+        """ Also True for a malformed content-length, so that response is passed through untouched """
+        try:
+            return int(headers.get("content-length", self.minimum_size)) < self.minimum_size
+        except ValueError:
+            return True
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = self.select_encoding(Headers(scope=scope))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        compressor: Compressor | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                passthrough = (
+                    message["status"] in (204, 206, 304)
+                    or scope.get("endpoint") in self.excluded_endpoints
+                    or not self.is_compressible(headers)
+                    or self.is_below_minimum_size(headers)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Held back until the first body chunk shows whether (and how) to compress
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                if start_message is not None:
+                    await send(start_message)
+                    start_message = None
+                    passthrough = True
+                await send(message)
+                return
+
+            body: bytes = message.get("body", b"")
+            more_body: bool = message.get("more_body", False)
+
+            if compressor is None and start_message is not None:
+                if not more_body:
+                    await self.send_complete_body(start_message, body, encoding, send)
+                    start_message = None
+                    return
+
+                compressor = self.compressors[encoding]()
+                headers = MutableHeaders(scope=start_message)
+                self.set_encoding_headers(headers, encoding)
+                del headers["content-length"]
+                await send(start_message)
+                start_message = None
+
+            chunk = compressor.compress(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def send_complete_body(self, start_message: Message, body: bytes, encoding: str, send: Send) -> None:
+        headers = MutableHeaders(scope=start_message)
+        if len(body) < self.minimum_size:
+            await send(start_message)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        compressed_body = self.compress_cached(body, encoding)
+        self.set_encoding_headers(headers, encoding)
+        headers["content-length"] = str(len(compressed_body))
+        await send(start_message)
+        await send({"type": "http.response.body", "body": compressed_body})
+
+    def compress_cached(self, body: bytes, encoding: str) -> bytes:
+        if len(body) > self.CACHE_MAX_BODY_BYTES:
+            return self.compress(body, encoding)
+
+        key = (encoding, hashlib.blake2b(body, digest_size=16).digest())
+        if (compressed_body := self._cache.get(key)) is not None:
+            self._cache.move_to_end(key)
+            return compressed_body
+
+        compressed_body = self.compress(body, encoding)
+        self._cache[key] = compressed_body
+        if len(self._cache) > self.CACHE_MAX_ENTRIES:
+            self._cache.popitem(last=False)
+        return compressed_body
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        compressor = self.compressors[encoding]()
+        return compressor.compress(body) + compressor.finish()
+
+    @staticmethod
+    def set_encoding_headers(headers: MutableHeaders, encoding: str) -> None:
+        headers["content-encoding"] = encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The compressed body is a different representation, so a strong validator no longer applies byte-for-byte
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
@@ -2,55 +2,57 @@ import json
 import logging
 import time
 from pprint import pformat
+from typing import Callable, Iterable
 
-from fastapi import Request, Response, FastAPI
-from starlette.concurrency import iterate_in_threadpool
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.routing import Match
+from starlette.datastructures import MutableHeaders, Headers
+from starlette.requests import Request
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
 
 from smib.config import webserver
-from smib.utilities.functions import weak_lru
 
 
-class DeprecatedRouteMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, fastapi_app: FastAPI):
-        super().__init__(app)
-        self.fastapi_app = fastapi_app
+def get_deprecated_endpoints(routes: Iterable[BaseRoute]) -> frozenset[Callable]:
+    deprecated_endpoints: set[Callable] = set()
+    for route in routes:
+        if hasattr(route, "effective_route_contexts"):
+            # FastAPI keeps included routers wrapped, so deprecation may also come from the include itself
+            deprecated_endpoints.update(
+                route_context.original_route.endpoint
+                for route_context in route.effective_route_contexts()
+                if getattr(route_context, "deprecated", False) and hasattr(route_context.original_route, "endpoint")
+            )
+        elif getattr(route, "deprecated", False) and hasattr(route, "endpoint"):
+            deprecated_endpoints.add(route.endpoint)
+    return frozenset(deprecated_endpoints)
+
+
+class DeprecatedRouteMiddleware:
+    def __init__(self, app: ASGIApp, deprecated_endpoints: frozenset[Callable]):
+        self.app: ASGIApp = app
+        self.deprecated_endpoints: frozenset[Callable] = deprecated_endpoints
         self.logger = logging.getLogger(self.__class__.__name__)
 
-    async def dispatch(self, request: Request, call_next):
-        response: Response = await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.deprecated_endpoints:
+            await self.app(scope, receive, send)
+            return
 
-        if self.uses_deprecated_route(request):
-            self.logger.warning(f"Deprecated endpoint used: {request.method} {request.url.path}; IP: {request.client.host}")
-            response.headers.append("Deprecation", "true")
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and self.uses_deprecated_route(scope):
+                client_host = scope["client"][0] if scope.get("client") else None
+                self.logger.warning(f"Deprecated endpoint used: {scope['method']} {scope['path']}; IP: {client_host}")
+                MutableHeaders(scope=message).append("Deprecation", "true")
+            await send(message)
 
-        return response
+        await self.app(scope, receive, send_wrapper)
 
-    def uses_deprecated_route(self, request: Request) -> bool:
-        scope = {
-            "type": request.scope["type"],
-            "method": request.scope["method"],
-            "path": request.scope["path"],
-            "path_params": request.scope.get("path_params", {}),
-            "root_path": request.scope["root_path"],
-        }
+    def uses_deprecated_route(self, scope: Scope) -> bool:
+        # The router stores the matched endpoint in the (shared) scope before calling it
+        return scope.get("endpoint") in self.deprecated_endpoints
 
-        # Convert to string to allow for caching
-        scope_str = json.dumps(scope)
-        return self._uses_deprecated_route(scope_str)
 
-    @weak_lru(maxsize=128)
-    def _uses_deprecated_route(self, scope_str: str) -> bool:
-        scope = json.loads(scope_str)
-        for route in self.fastapi_app.routes:
-            match, _ = route.matches(scope)
-            if match == Match.FULL and getattr(route, "deprecated", False):
-                return True
-        return False
-
-
-class HttpRequestLoggingMiddleware(BaseHTTPMiddleware):
+class HttpRequestLoggingMiddleware:
     EXCLUDED_PATHS = {
         "/openapi.json",
         "/api/docs",
@@ -63,8 +65,11 @@ class HttpRequestLoggingMiddleware(BaseHTTPMiddleware):
 
     LOCAL_HOSTS = {"127.0.0.1", "localhost", "::1"}
 
-    def __init__(self, app):
-        super().__init__(app)
+    # Request and response bodies are teed into the log as they stream past, up to this many bytes each
+    MAX_LOGGED_BODY_BYTES = 64 * 1024
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
         self.logger = logging.getLogger(self.__class__.__name__)
 
     def should_log_request(self, request: Request) -> bool:
@@ -83,39 +88,73 @@ class HttpRequestLoggingMiddleware(BaseHTTPMiddleware):
 
         return True
 
-    async def dispatch(self, request: Request, call_next) -> Response:
-        should_log = self.should_log_request(request)
-        
-        if should_log:
-            self.logger.debug(f"Received {request.method} request to {request.url.path} from {request.client.host}")
-            self.logger.debug(f"Request Headers {pformat(request.headers.items())}")
-            
-            # Safely get request body as JSON
-            try:
-                req_body = await request.json()
-            except Exception:
-                req_body = None
-            self.logger.debug(f"Request Body {pformat(req_body)}")
-
-        # Measure processing time
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not webserver.log_request_details:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        if not self.should_log_request(request):
+            await self.app(scope, receive, send)
+            return
+
+        self.logger.debug(f"Received {request.method} request to {request.url.path} from {request.client.host}")
+        self.logger.debug(f"Request Headers {pformat(request.headers.items())}")
+
+        request_body = bytearray()
+        request_body_truncated = False
+        response_body = bytearray()
+        response_body_truncated = False
+
+        async def receive_wrapper() -> Message:
+            nonlocal request_body_truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                request_body_truncated |= self._tee(request_body, message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_body_truncated
+            if message["type"] == "http.response.start":
+                # By the time the response starts, the endpoint has read as much of the request body as it is going to
+                self.logger.debug(f"Request Body {pformat(self._decode_json(request_body, request_body_truncated))}")
+                self.logger.debug(f"Returning {message['status']} response to {request.url.path}")
+                self.logger.debug(f"Response Headers {pformat(Headers(raw=message['headers']).items())}")
+
+            elif message["type"] == "http.response.body":
+                response_body_truncated |= self._tee(response_body, message.get("body", b""))
+                if not message.get("more_body", False):
+                    process_time = time.perf_counter() - start_time
+                    self.logger.debug(f"Request processing time: {process_time:.4f} seconds")
+                    self._log_response_body(response_body, response_body_truncated)
+
+            await send(message)
+
         start_time = time.perf_counter()
-        response = await call_next(request)
-        process_time = time.perf_counter() - start_time
-
-        if should_log:
-            self.logger.debug(f"Returning {response.status_code} response to {request.url.path}")
-            self.logger.debug(f"Response Headers {pformat(response.headers.items())}")
-            self.logger.debug(f"Request processing time: {process_time:.4f} seconds")
-
-            # Capture and reconstruct response body
-            res_body = [section async for section in response.body_iterator]
-            response.body_iterator = iterate_in_threadpool(iter(res_body))
-
-            try:
-                # Attempt to decode the response body
-                decoded_body = res_body[0].decode() if res_body else None
-                self.logger.debug(f"Response Body: {pformat(decoded_body)}")
-            except Exception as e:
-                self.logger.debug(f"Could not decode response body: {str(e)}")
-
-        return response
+        await self.app(scope, receive_wrapper, send_wrapper)
+
+    def _tee(self, buffer: bytearray, chunk: bytes) -> bool:
+        """ Copies as much of the chunk into the buffer as the cap allows, returns True if anything was dropped """
+        remaining = self.MAX_LOGGED_BODY_BYTES - len(buffer)
+        buffer += chunk[:max(remaining, 0)]
+        return len(chunk) > remaining
+
+    @staticmethod
+    def _decode_json(body: bytearray, truncated: bool):
+        if not body or truncated:
+            return None
+        try:
+            return json.loads(body)
+        except Exception:
+            return None
+
+    def _log_response_body(self, body: bytearray, truncated: bool):
+        try:
+            # Attempt to decode the response body
+            if truncated:
+                decoded_body = f"{body.decode(errors='replace')}... (truncated at {self.MAX_LOGGED_BODY_BYTES} bytes)"
+            else:
+                decoded_body = body.decode() if body else None
+            self.logger.debug(f"Response Body: {pformat(decoded_body)}")
+        except Exception as e:
+            self.logger.debug(f"Could not decode response body: {str(e)}")
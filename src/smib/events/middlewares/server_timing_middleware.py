@@ -0,0 +1,33 @@
+import logging
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from smib.metrics.server_timing import start_request_timings
+
+
+class ServerTimingMiddleware:
+    """
+    Collects the time spent in each stage of a request (Bolt request conversion, dispatch, listener, MongoDB commands,
+    Slack Web API calls) and sends it in a Server-Timing header, and in a debug log line.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_timings = start_request_timings()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                server_timing = request_timings.to_header()
+                MutableHeaders(scope=message).append("Server-Timing", server_timing)
+                self.logger.debug(f"{scope['method']} {scope['path']}: {server_timing}")
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
@@ -0,0 +1,40 @@
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Scope, Receive, Send, Message
+
+from smib.tracing import SpanKind, StatusCode, start_span, parse_traceparent
+
+
+class TracingMiddleware:
+    """
+    Starts a trace for every HTTP request and websocket connection, continuing the caller's trace when a W3C
+    traceparent header is sent. The Bolt dispatch, listeners, MongoDB commands and Slack Web API calls made while
+    handling it are recorded as its descendants.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"] if scope["type"] == "http" else "WS"
+        attributes = {"http.request.method": method, "url.path": scope["path"], "url.scheme": scope["scheme"]}
+        parent = parse_traceparent(Headers(scope=scope).get("traceparent"))
+
+        with start_span(f"{method} {scope['path']}", SpanKind.SERVER, attributes, parent) as span:
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.set_status(StatusCode.ERROR, f"HTTP {message['status']}")
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                # Name the span after the matched route once routing has happened, e.g. GET /api/space/state/{state}
+                if (route_path := getattr(scope.get("route"), "path", None)) is not None:
+                    span.name = f"{method} {scope.get('root_path', '').rstrip('/')}{route_path}"
+                    span.set_attribute("http.route", route_path)
@@ -0,0 +1,171 @@
+import asyncio
+import logging
+from collections import defaultdict
+from logging import Logger
+from typing import Any, Callable, Literal
+from uuid import uuid4
+
+from bson import ObjectId
+from pymongo import CursorType
+from pymongo.asynchronous.cursor import AsyncCursor
+from pymongo.asynchronous.database import AsyncDatabase
+from pymongo.errors import CollectionInvalid, OperationFailure, PyMongoError
+
+from smib.metrics import get_metrics_registry
+
+PUBSUB_MESSAGES = get_metrics_registry().counter(
+    "smib_pubsub_messages", "Messages through the pub/sub backend, by direction", ("topic", "direction"))
+
+PubSubBackendName = Literal["local", "mongodb"]
+Subscriber = Callable[[Any], Any]
+
+
+class PubSub:
+    """
+    Delivers messages published on a topic to every subscriber of it, in this process only.
+    This is the default backend, and stands in for the others wherever there is only one process.
+    """
+
+    def __init__(self):
+        self.subscribers: defaultdict[str, list[Subscriber]] = defaultdict(list)
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+
+    def subscribe(self, topic: str, subscriber: Subscriber) -> None:
+        self.subscribers[topic].append(subscriber)
+
+    def unsubscribe(self, topic: str, subscriber: Subscriber) -> None:
+        if subscriber in (subscribers := self.subscribers.get(topic, [])):
+            subscribers.remove(subscriber)
+
+    async def publish(self, topic: str, message: Any) -> None:
+        self.deliver(topic, message)
+
+    def deliver(self, topic: str, message: Any) -> None:
+        """ Hands a message to this process's subscribers. They are called synchronously, so must not block """
+        PUBSUB_MESSAGES.labels(topic, "delivered").inc()
+        for subscriber in list(self.subscribers.get(topic, [])):
+            try:
+                subscriber(message)
+            except Exception as e:
+                self.logger.exception(f"Subscriber to {topic} failed: {repr(e)}")
+
+
+class MongoPubSub(PubSub):
+    """
+    Delivers published messages to the subscribers in every process sharing the database, as well as this one.
+
+    Messages are inserted into a small capped collection, which every process follows with a tailable cursor. Capped
+    collections keep insertion order and need no replica set, unlike change streams. Messages published here are
+    delivered locally straight away, and skipped when they come back round from the collection.
+    Messages must be BSON encodable, e.g. dicts of JSON types, str or bytes.
+    """
+    COLLECTION_NAME: str = "pubsub_messages"
+    COLLECTION_SIZE: int = 1024 * 1024  # bytes, old messages are overwritten first
+    RETRY_INTERVAL: float = 1
+
+    def __init__(self, database: AsyncDatabase):
+        super().__init__()
+        self.database: AsyncDatabase = database
+        self.collection = database[self.COLLECTION_NAME]
+        # Identifies the messages this process published
+        self.origin: str = uuid4().hex
+        self._follow_task: asyncio.Task | None = None
+        self._cursor: AsyncCursor | None = None
+
+    async def publish(self, topic: str, message: Any) -> None:
+        self.deliver(topic, message)
+        await self.collection.insert_one({"topic": topic, "message": message, "origin": self.origin})
+        PUBSUB_MESSAGES.labels(topic, "published").inc()
+
+    async def create_collection(self) -> None:
+        try:
+            await self.database.create_collection(self.COLLECTION_NAME, capped=True, size=self.COLLECTION_SIZE)
+        except CollectionInvalid:
+            pass  # Already exists
+        except OperationFailure as e:
+            # Another process created it first
+            if e.code != 48:  # NamespaceExists
+                raise
+
+        # A tailable cursor on an empty collection dies straight away, so there is always at least this in it
+        if await self.collection.find_one({}, projection={"_id": 1}) is None:
+            await self.collection.insert_one({"topic": None, "origin": self.origin})
+
+    async def get_latest_id(self) -> ObjectId | None:
+        latest = await self.collection.find_one({}, projection={"_id": 1}, sort=[("$natural", -1)])
+        return latest["_id"] if latest is not None else None
+
+    async def get_resume_id(self, after: ObjectId | None) -> ObjectId | None:
+        """ Where to carry on following from: after, if it is still in the collection, otherwise the latest message """
+        if after is not None and await self.collection.find_one({"_id": after}, projection={"_id": 1}) is not None:
+            return after
+        if after is not None:
+            self.logger.warning(f"{self.COLLECTION_NAME} wrapped while not following it, messages may have been missed")
+        return await self.get_latest_id()
+
+    async def follow(self, after: ObjectId | None) -> ObjectId | None:
+        """
+        Delivers messages from other processes as they are inserted, until the cursor dies, returning the last id seen.
+
+        ObjectIds are only ordered within the process that created them, so rather than querying for ids greater than
+        after, the cursor reads the collection in insertion order and skips everything up to and including after.
+        """
+        caught_up = after is None
+        self._cursor = cursor = self.collection.find({}, cursor_type=CursorType.TAILABLE_AWAIT)
+        try:
+            while cursor.alive:
+                try:
+                    document = await cursor.next()
+                except StopAsyncIteration:
+                    # Nothing was inserted while the server waited, the cursor is still open for the next insert
+                    continue
+
+                if not caught_up:
+                    caught_up = document["_id"] == after
+                    continue
+
+                after = document["_id"]
+                if document["origin"] != self.origin and document["topic"] is not None:
+                    self.deliver(document["topic"], document.get("message"))
+        finally:
+            await cursor.close()
+        return after
+
+    async def start(self) -> None:
+        self._follow_task = asyncio.create_task(self.follow_forever())
+        try:
+            await self._follow_task
+        except asyncio.CancelledError:
+            # stop() cancelling the follow task is how this ends, anything cancelling start() itself is passed on
+            if asyncio.current_task().cancelling():
+                raise
+
+    async def follow_forever(self) -> None:
+        after: ObjectId | None = None
+        while True:
+            try:
+                await self.create_collection()
+                # Only messages published from now on, or since the last one seen if following again
+                after = await self.get_resume_id(after)
+                self.logger.info(f"Following {self.COLLECTION_NAME} for published messages")
+                after = await self.follow(after)
+                # Only when the server kills the cursor, e.g. the collection was dropped
+                self.logger.warning(f"Cursor on {self.COLLECTION_NAME} died, following it again in {self.RETRY_INTERVAL}s")
+            except PyMongoError as e:
+                self.logger.warning(f"Lost {self.COLLECTION_NAME}, retrying in {self.RETRY_INTERVAL}s: {repr(e)}")
+            await asyncio.sleep(self.RETRY_INTERVAL)
+
+    async def stop(self) -> None:
+        if self._follow_task is not None:
+            self._follow_task.cancel()
+            await asyncio.gather(self._follow_task, return_exceptions=True)
+        # Normally already closed by follow() on its way out, but the server side cursor must not be left open
+        if self._cursor is not None:
+            await self._cursor.close()
+        self.logger.info(f"Stopped following {self.COLLECTION_NAME}")
+
+
+def create_pubsub(backend: PubSubBackendName, database: AsyncDatabase) -> PubSub:
+    if backend == "mongodb":
+        return MongoPubSub(database)
+    return PubSub()
@@ -0,0 +1,40 @@
+from fastapi.routing import APIRoute
+
+from smib.events.routes.cached_api_route import CachedAPIRoute, ResponseCache, CacheKey, default_cache_key
+from smib.events.routes.coalesced_api_route import CoalescedAPIRoute
+from smib.events.routes.conditional_api_route import ConditionalAPIRoute, Validator
+
+
+def create_api_route_class(
+        *,
+        validator: Validator | None = None,
+        response_cache: ResponseCache | None = None,
+        cache_ttl: float | None = None,
+        cache_key: CacheKey | None = None,
+        coalesce: bool = False,
+) -> type[APIRoute] | None:
+    """
+    Builds the route class for a single route from the optional behaviours it uses.
+    Conditional requests are answered before the response cache is consulted, and only cache misses are coalesced.
+    A subclass per route keeps the options attached even if FastAPI re-creates the route from its class.
+    """
+    bases: list[type[APIRoute]] = []
+    attributes: dict = {}
+
+    if validator is not None:
+        bases.append(ConditionalAPIRoute)
+        attributes["validator"] = staticmethod(validator)
+
+    if cache_ttl is not None:
+        bases.append(CachedAPIRoute)
+        attributes["response_cache"] = response_cache
+        attributes["cache_ttl"] = cache_ttl
+        attributes["cache_key"] = staticmethod(cache_key or default_cache_key)
+
+    if coalesce:
+        bases.append(CoalescedAPIRoute)
+        attributes["coalesce_key"] = staticmethod(cache_key or default_cache_key)
+
+    if not bases:
+        return None
+    return type("".join(base.__name__.removesuffix("APIRoute") for base in bases) + "APIRoute", tuple(bases), attributes)
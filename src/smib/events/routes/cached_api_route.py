@@ -0,0 +1,117 @@
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Awaitable, Hashable, Any
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+CacheKey = Callable[[Request], Hashable]
+
+
+@dataclass(frozen=True, slots=True)
+class CachedResponse:
+    status_code: int
+    raw_headers: tuple[tuple[bytes, bytes], ...]
+    body: bytes
+    expires_at: float
+    version: Hashable
+
+    def to_response(self) -> Response:
+        response = Response(content=self.body, status_code=self.status_code)
+        response.raw_headers = list(self.raw_headers)
+        return response
+
+
+class ResponseCache:
+    """
+    Bounded, in process LRU of serialized responses, grouped by the route path they were produced for.
+    Invalidations are published on INVALIDATION_TOPIC, so every process evicts its copy (see on_invalidation).
+    """
+    MAX_ENTRIES: int = 256
+    MAX_BODY_BYTES: int = 1024 * 1024
+    INVALIDATION_TOPIC: str = "http_response_cache_invalidation"
+
+    def __init__(self):
+        self._entries: OrderedDict[tuple[str, Hashable], CachedResponse] = OrderedDict()
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def get(self, route_path: str, key: Hashable, version: Hashable = None) -> Response | None:
+        """ A response cached at a different version (see ConditionalAPIRoute) is stale, whatever its TTL """
+        cached_response = self._entries.get((route_path, key))
+        if cached_response is None:
+            return None
+        if cached_response.expires_at <= time.monotonic() or cached_response.version != version:
+            del self._entries[(route_path, key)]
+            return None
+        self._entries.move_to_end((route_path, key))
+        return cached_response.to_response()
+
+    def set(self, route_path: str, key: Hashable, response: Response, ttl: float, version: Hashable = None) -> None:
+        body: bytes | None = getattr(response, "body", None)
+        # Streamed/file responses and responses with background tasks are never cached
+        if response.status_code != 200 or body is None or response.background is not None or len(body) > self.MAX_BODY_BYTES:
+            return
+
+        self._entries[(route_path, key)] = CachedResponse(
+            status_code=response.status_code,
+            raw_headers=tuple(response.raw_headers),
+            body=body,
+            expires_at=time.monotonic() + ttl,
+            version=version,
+        )
+        self._entries.move_to_end((route_path, key))
+        if len(self._entries) > self.MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, route_path: str, key: Hashable | None = None) -> None:
+        """ Evict one cached response of a route, or all of them when no key is given """
+        if key is not None:
+            self._entries.pop((route_path, key), None)
+            return
+
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] == route_path]:
+            del self._entries[entry_key]
+        self.logger.debug(f"Invalidated cached responses for {route_path}")
+
+    def on_invalidation(self, message: dict[str, Any]) -> None:
+        """ Subscriber for INVALIDATION_TOPIC. Keys come back from the pub/sub backend with lists in place of tuples """
+        self.invalidate(message["route_path"], to_hashable(message.get("key")))
+
+
+def to_hashable(value: Any) -> Hashable:
+    if isinstance(value, list):
+        return tuple(to_hashable(item) for item in value)
+    return value
+
+
+def default_cache_key(request: Request) -> Hashable:
+    return request.url.path, request.url.query
+
+
+class CachedAPIRoute(APIRoute):
+    """
+    APIRoute that serves responses from a ResponseCache while they are fresh, without running the endpoint (and so
+    without dispatching to Bolt). Responses are cached per path, query string, or the value of the route's cache_key.
+    On routes with a validator, a response is only served while the validator still returns the value it was cached at.
+    """
+    response_cache: ResponseCache
+    cache_ttl: float
+    cache_key: CacheKey
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        route_handler = super().get_route_handler()
+        response_cache, cache_ttl, cache_key, route_path = self.response_cache, self.cache_ttl, self.cache_key, self.path
+
+        async def cached_route_handler(request: Request) -> Response:
+            key, version = cache_key(request), getattr(request.state, "validator_value", None)
+            if (cached_response := response_cache.get(route_path, key, version)) is not None:
+                return cached_response
+
+            response = await route_handler(request)
+            response_cache.set(route_path, key, response, cache_ttl, version)
+            return response
+
+        return cached_route_handler
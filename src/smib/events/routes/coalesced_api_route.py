@@ -0,0 +1,39 @@
+from typing import Callable, Awaitable
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+from smib.events.routes.cached_api_route import CacheKey
+from smib.utilities.single_flight import SingleFlight
+
+
+class CoalescedAPIRoute(APIRoute):
+    """
+    APIRoute that runs the endpoint (and so dispatches to Bolt) once for concurrent identical requests, sharing the
+    response with every request that arrived while it was in flight. Requests are identical when their path and query
+    string, or the value of the route's coalesce_key, match, and they validated against the same version.
+    """
+    coalesce_key: CacheKey
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        route_handler = super().get_route_handler()
+        coalesce_key = self.coalesce_key
+        single_flight = SingleFlight(f"route:{','.join(sorted(self.methods))} {self.path}")
+
+        async def coalesced_route_handler(request: Request) -> Response:
+            key = coalesce_key(request), getattr(request.state, "validator_value", None)
+            response, shared = await single_flight.do_shared(key, lambda: route_handler(request))
+            if not shared:
+                return response
+
+            body: bytes | None = getattr(response, "body", None)
+            if body is None:
+                # A streamed response can only be sent once, so this request needs its own
+                return await route_handler(request)
+
+            shared_response = Response(content=body, status_code=response.status_code)
+            shared_response.raw_headers = list(response.raw_headers)
+            return shared_response
+
+        return coalesced_route_handler
@@ -0,0 +1,77 @@
+import inspect
+from datetime import datetime, UTC
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Callable, Awaitable
+
+from fastapi.routing import APIRoute
+from starlette.requests import Request
+from starlette.responses import Response
+
+Validator = Callable[[Request], Awaitable[str | datetime | None] | str | datetime | None]
+
+
+class ConditionalAPIRoute(APIRoute):
+    """
+    APIRoute that answers conditional GETs (If-None-Match / If-Modified-Since) with 304 Not Modified before the endpoint,
+    and therefore Bolt and any database work, runs.
+
+    The validator is called with the request and returns either an opaque version string (sent as the ETag) or the last
+    modified time (sent as Last-Modified, with an ETag derived from it). None skips validation for that request.
+    The value is left on request.state.validator_value, so cached and coalesced responses are only shared between
+    requests that validated against the same version.
+    """
+    validator: Validator
+
+    def get_route_handler(self) -> Callable[[Request], Awaitable[Response]]:
+        route_handler = super().get_route_handler()
+        validator = self.validator
+
+        async def conditional_route_handler(request: Request) -> Response:
+            validator_value = validator(request)
+            if inspect.isawaitable(validator_value):
+                validator_value = await validator_value
+            request.state.validator_value = validator_value
+
+            if validator_value is None:
+                return await route_handler(request)
+
+            validator_headers = get_validator_headers(validator_value)
+            if is_not_modified(request, validator_headers):
+                return Response(status_code=304, headers=validator_headers)
+
+            response = await route_handler(request)
+            if response.status_code == 200:
+                response.headers.update(validator_headers)
+            return response
+
+        return conditional_route_handler
+
+
+def get_validator_headers(validator_value: str | datetime) -> dict[str, str]:
+    if isinstance(validator_value, datetime):
+        last_modified = validator_value if validator_value.tzinfo else validator_value.replace(tzinfo=UTC)
+        return {
+            "ETag": f'"{last_modified.timestamp():.6f}"',
+            "Last-Modified": format_datetime(last_modified.astimezone(UTC), usegmt=True),
+        }
+    return {"ETag": f'"{validator_value}"'}
+
+
+def is_not_modified(request: Request, validator_headers: dict[str, str]) -> bool:
+    if (if_none_match := request.headers.get("if-none-match")) is not None:
+        etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in etags or validator_headers["ETag"] in etags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or "Last-Modified" not in validator_headers:
+        return False
+
+    try:
+        modified_since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if modified_since.tzinfo is None:
+        modified_since = modified_since.replace(tzinfo=UTC)
+    # HTTP dates only have second precision
+    last_modified = parsedate_to_datetime(validator_headers["Last-Modified"])
+    return last_modified <= modified_since
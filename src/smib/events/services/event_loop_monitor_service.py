@@ -0,0 +1,113 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from logging import Logger
+from types import FrameType
+
+from smib.metrics import get_metrics_registry
+from smib.plugins.lifecycle_manager import PluginLifecycleManager
+
+EVENT_LOOP_LAG = get_metrics_registry().histogram(
+    "smib_event_loop_lag_seconds", "How late the event loop ran a periodic callback",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)).labels()
+EVENT_LOOP_BLOCKED_CALLS = get_metrics_registry().counter(
+    "smib_event_loop_blocked_calls", "Single callbacks that blocked the event loop for longer than the threshold, by plugin", ("plugin",))
+EVENT_LOOP_BLOCKED_SECONDS = get_metrics_registry().counter(
+    "smib_event_loop_blocked_seconds", "Time the event loop was blocked by single callbacks, by plugin", ("plugin",))
+
+
+@dataclass(frozen=True, slots=True)
+class BlockingCallSite:
+    owner: str
+    # The outermost plugin function on the stack, i.e. the listener, route or job that was called
+    entrypoint: str | None
+    location: str
+
+    def __str__(self) -> str:
+        entrypoint = f" in {self.entrypoint}" if self.entrypoint else ""
+        return f"{self.owner}{entrypoint} ({self.location})"
+
+
+class EventLoopMonitorService:
+    """
+    Samples how late the event loop runs a periodic callback (the lag every other callback is also seeing) into a
+    histogram, and watches for single callbacks blocking the loop from a separate thread.
+
+    When the loop has been blocked for longer than the threshold, the watchdog thread captures the loop thread's stack
+    and attributes the blocking call to the plugin owning the innermost plugin frame. Once the loop recovers, the total
+    blocked time is logged as a warning and counted against that plugin.
+    """
+    SAMPLE_INTERVAL: float = 0.5
+
+    def __init__(self, plugin_lifecycle_manager: PluginLifecycleManager, block_threshold: float):
+        self.plugin_lifecycle_manager: PluginLifecycleManager = plugin_lifecycle_manager
+        self.block_threshold: float = block_threshold
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+
+        self._loop_thread_id: int | None = None
+        self._last_sample: float = time.monotonic()
+        self._pending_call_site: BlockingCallSite | None = None
+        self._stop_event: threading.Event = threading.Event()
+        self._watchdog: threading.Thread | None = None
+
+    def find_call_site(self, frame: FrameType | None) -> BlockingCallSite | None:
+        if frame is None:
+            return None
+
+        location = f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+        owner, entrypoint = None, None
+        while frame is not None:
+            if (frame_owner := self.plugin_lifecycle_manager.find_plugin_name_by_path(frame.f_code.co_filename)) is not None:
+                if owner is None:
+                    owner = frame_owner
+                    location = f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_qualname}"
+                if frame_owner == owner:
+                    entrypoint = frame.f_code.co_qualname
+            frame = frame.f_back
+
+        return BlockingCallSite(owner=owner or "smib", entrypoint=entrypoint, location=location)
+
+    def watch(self) -> None:
+        reported_sample: float | None = None
+        while not self._stop_event.wait(self.block_threshold / 2):
+            last_sample = self._last_sample
+            blocked_for = time.monotonic() - last_sample - self.SAMPLE_INTERVAL
+            if blocked_for < self.block_threshold or reported_sample == last_sample:
+                continue
+
+            reported_sample = last_sample
+            # The loop thread is still inside the blocking call, so its stack shows who is responsible
+            self._pending_call_site = self.find_call_site(sys._current_frames().get(self._loop_thread_id))
+
+    def record_sample(self, lag: float) -> None:
+        EVENT_LOOP_LAG.observe(lag)
+        if lag < self.block_threshold:
+            return
+
+        call_site, self._pending_call_site = self._pending_call_site, None
+        owner = call_site.owner if call_site else "unknown"
+        EVENT_LOOP_BLOCKED_CALLS.labels(owner).inc()
+        EVENT_LOOP_BLOCKED_SECONDS.labels(owner).inc(lag)
+        self.logger.warning(f"Event loop was blocked for {lag:.3f}s by {call_site or 'an unknown callback'}")
+
+    async def start(self):
+        self._loop_thread_id = threading.get_ident()
+        self._last_sample = time.monotonic()
+        self._stop_event.clear()
+        self._watchdog = threading.Thread(target=self.watch, name="smib-event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+        while True:
+            await asyncio.sleep(self.SAMPLE_INTERVAL)
+            now = time.monotonic()
+            lag = max(now - self._last_sample - self.SAMPLE_INTERVAL, 0)
+            self._last_sample = now
+            self.record_sample(lag)
+
+    async def stop(self):
+        self._stop_event.set()
+        if self._watchdog is not None:
+            await asyncio.to_thread(self._watchdog.join)
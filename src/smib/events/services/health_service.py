@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, UTC
+from logging import Logger
+
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from smib.db.manager import DatabaseManager
+from smib.events.services.scheduled_event_service import ScheduledEventService
+from smib.events.services.slack_event_service import SlackEventService
+
+
+@dataclass(frozen=True, slots=True)
+class HealthSnapshot:
+    refreshed_at: datetime
+    event_loop_lag_ms: float
+    mongo_ping_ms: float | None
+    mongo_error: str | None
+    # None when this process does not run the component (e.g. HTTP workers)
+    slack_connected: bool | None
+    scheduler_running: bool | None
+
+    @property
+    def ready(self) -> bool:
+        return self.mongo_error is None and self.slack_connected is not False and self.scheduler_running is not False
+
+
+class HealthService:
+    """
+    Keeps a health snapshot of this process up to date in the background, and serves it on liveness and readiness
+    routes mounted directly on the FastAPI app. The routes never touch Bolt or the database, so probes cost next to
+    nothing and cannot add load to a struggling database.
+    """
+    REFRESH_INTERVAL: float = 5
+    MONGO_PING_TIMEOUT: float = 2
+    # The process is not live if the snapshot has not been refreshed for this long, e.g. because the event loop is blocked
+    STALE_AFTER: float = 30
+
+    LIVE_PATH: str = "/health/live"
+    READY_PATH: str = "/health/ready"
+
+    def __init__(self, database_manager: DatabaseManager, slack_event_service: SlackEventService | None = None,
+                 scheduled_event_service: ScheduledEventService | None = None):
+        self.database_manager: DatabaseManager = database_manager
+        self.slack_event_service: SlackEventService | None = slack_event_service
+        self.scheduled_event_service: ScheduledEventService | None = scheduled_event_service
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+
+        self.snapshot: HealthSnapshot | None = None
+        self._snapshot_body: bytes = b"{}"
+        self._refreshed_at_monotonic: float = time.monotonic()
+
+    def mount(self, fastapi_app: FastAPI) -> None:
+        # Plain Starlette routes, ahead of every plugin route
+        fastapi_app.router.routes[0:0] = [
+            Route(self.LIVE_PATH, self.live, methods=["GET"], include_in_schema=False),
+            Route(self.READY_PATH, self.ready, methods=["GET"], include_in_schema=False),
+        ]
+
+    @property
+    def is_live(self) -> bool:
+        return time.monotonic() - self._refreshed_at_monotonic < self.STALE_AFTER
+
+    async def live(self, request: Request) -> Response:
+        return Response(self._snapshot_body, status_code=200 if self.is_live else 503, media_type="application/json")
+
+    async def ready(self, request: Request) -> Response:
+        is_ready = self.is_live and self.snapshot is not None and self.snapshot.ready
+        return Response(self._snapshot_body, status_code=200 if is_ready else 503, media_type="application/json")
+
+    async def ping_mongo(self) -> tuple[float | None, str | None]:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.database_manager.ping(), self.MONGO_PING_TIMEOUT)
+        except Exception as e:
+            return None, type(e).__name__
+        return (time.perf_counter() - start) * 1000, None
+
+    async def is_slack_connected(self) -> bool | None:
+        if self.slack_event_service is None:
+            return None
+        try:
+            return await self.slack_event_service.service.client.is_connected()
+        except Exception:
+            return False
+
+    def is_scheduler_running(self) -> bool | None:
+        if self.scheduled_event_service is None:
+            return None
+        return self.scheduled_event_service.scheduler.running
+
+    async def refresh(self, event_loop_lag: float) -> None:
+        mongo_ping_ms, mongo_error = await self.ping_mongo()
+        snapshot = HealthSnapshot(
+            refreshed_at=datetime.now(UTC),
+            event_loop_lag_ms=round(event_loop_lag * 1000, 3),
+            mongo_ping_ms=round(mongo_ping_ms, 3) if mongo_ping_ms is not None else None,
+            mongo_error=mongo_error,
+            slack_connected=await self.is_slack_connected(),
+            scheduler_running=self.is_scheduler_running(),
+        )
+        if self.snapshot is not None and snapshot.ready != self.snapshot.ready:
+            self.logger.warning(f"Readiness changed to {snapshot.ready}: {snapshot}")
+
+        self.snapshot = snapshot
+        self._snapshot_body = json.dumps({**asdict(snapshot), "ready": snapshot.ready}, default=str).encode()
+        self._refreshed_at_monotonic = time.monotonic()
+
+    async def start(self):
+        event_loop_lag: float = 0
+        while True:
+            try:
+                await self.refresh(event_loop_lag)
+            except Exception as e:
+                self.logger.exception(f"Failed to refresh health snapshot: {repr(e)}")
+
+            # How much later than asked for the sleep wakes up is how long callbacks are waiting on the event loop
+            sleep_start = time.monotonic()
+            await asyncio.sleep(self.REFRESH_INTERVAL)
+            event_loop_lag = max(time.monotonic() - sleep_start - self.REFRESH_INTERVAL, 0)
+
+    async def stop(self):
+        pass
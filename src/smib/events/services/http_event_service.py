@@ -3,19 +3,34 @@ import socket
 from functools import lru_cache
 from logging import Logger
 from pprint import pformat
+from typing import Callable
 
 from fastapi import FastAPI
 from uvicorn import Config, Server
 
-from smib.config import webserver, project, logging as logging_config
-from smib.events.middlewares.http_middleware import DeprecatedRouteMiddleware, HttpRequestLoggingMiddleware
+from smib.config import webserver, project, monitoring, logging as logging_config
+from smib.events.middlewares.compression_middleware import CompressionMiddleware
+from smib.events.middlewares.server_timing_middleware import ServerTimingMiddleware
+from smib.events.middlewares.tracing_middleware import TracingMiddleware
+from smib.events.middlewares.http_middleware import DeprecatedRouteMiddleware, HttpRequestLoggingMiddleware, \
+    get_deprecated_endpoints
+from smib.events.pubsub import PubSub
+from smib.events.routes.cached_api_route import ResponseCache
 from smib.logging_ import get_logging_config
+from smib.utilities.package import is_package_installed
 
 
 class HttpEventService:
-    def __init__(self):
+    def __init__(self, sockets: list[socket.socket] | None = None, pubsub: PubSub | None = None):
         self.logger: Logger = logging.getLogger(self.__class__.__name__)
         self.openapi_tags: list[dict] = []
+        # Pre-bound sockets to serve on (shared with the other HTTP workers), otherwise uvicorn binds its own
+        self.sockets: list[socket.socket] | None = sockets
+        self.uncompressed_endpoints: set[Callable] = set()
+        self.response_cache: ResponseCache = ResponseCache()
+        # Invalidations are published, so they reach the response cache of every process
+        self.pubsub: PubSub = pubsub or PubSub()
+        self.pubsub.subscribe(ResponseCache.INVALIDATION_TOPIC, self.response_cache.on_invalidation)
 
     @property
     @lru_cache(maxsize=1)
@@ -42,10 +57,22 @@ class HttpEventService:
             headers=self.headers,
             log_config=get_logging_config(logging_config.log_level),
             access_log=False,
+            http=self.http_implementation,
+            ws_ping_interval=webserver.websocket_ping_interval,
+            ws_ping_timeout=webserver.websocket_ping_timeout,
+            ws_max_size=webserver.websocket_max_message_size,
         )
         self.logger.debug(f"Uvicorn config:\n{pformat(config.__dict__)}")
         return config
 
+    @property
+    @lru_cache(maxsize=1)
+    def http_implementation(self) -> str:
+        if webserver.http_parser == "httptools" and not is_package_installed("httptools"):
+            self.logger.warning("httptools HTTP parser requested but httptools is not installed, falling back to h11")
+            return "h11"
+        return webserver.http_parser
+
     @property
     @lru_cache(maxsize=1)
     def uvicorn_server(self) -> Server:
@@ -63,8 +90,14 @@ class HttpEventService:
         return headers
 
     def apply_middlewares(self):
-        self.fastapi_app.add_middleware(DeprecatedRouteMiddleware, self.fastapi_app)
+        self.fastapi_app.add_middleware(DeprecatedRouteMiddleware, get_deprecated_endpoints(self.fastapi_app.routes))
         self.fastapi_app.add_middleware(HttpRequestLoggingMiddleware)
+        if monitoring.server_timing:
+            self.fastapi_app.add_middleware(ServerTimingMiddleware)
+        if webserver.compression_minimum_size is not None:
+            self.fastapi_app.add_middleware(CompressionMiddleware, webserver.compression_minimum_size, self.uncompressed_endpoints)
+        if monitoring.tracing_file is not None:
+            self.fastapi_app.add_middleware(TracingMiddleware)
 
     async def start(self):
         # On start, force re-generate swagger docs
@@ -76,7 +109,7 @@ class HttpEventService:
         self.fastapi_app.setup()
 
         self.logger.info(f"Starting webserver with root path prefix '{webserver.path_prefix}'")
-        await self.uvicorn_server.serve()
+        await self.uvicorn_server.serve(sockets=self.sockets)
 
     async def stop(self):
         if self.uvicorn_server.started:
@@ -0,0 +1,60 @@
+import asyncio
+import logging
+import multiprocessing
+import socket
+from logging import Logger
+from multiprocessing.context import SpawnProcess
+from typing import Callable
+
+from smib.events.services.http_event_service import HttpEventService
+
+
+class HttpWorkerService:
+    """
+    Runs the webserver in separate worker processes, all accepting connections on a socket bound by this (leader) process.
+    Each worker is a full, spawned SMIB process that loads every plugin but only serves HTTP.
+    """
+    MONITOR_INTERVAL: float = 5
+    STOP_TIMEOUT: float = 10
+
+    def __init__(self, http_event_service: HttpEventService, target: Callable[[list[socket.socket]], None], worker_count: int):
+        self.http_event_service: HttpEventService = http_event_service
+        self.target: Callable[[list[socket.socket]], None] = target
+        self.worker_count: int = worker_count
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+
+        self.sockets: list[socket.socket] = []
+        self.processes: list[SpawnProcess] = []
+
+    def spawn_worker(self, index: int) -> SpawnProcess:
+        context = multiprocessing.get_context("spawn")
+        process = context.Process(target=self.target, args=(self.sockets,), name=f"smib-http-worker-{index + 1}")
+        process.start()
+        self.logger.info(f"Started HTTP worker {process.name} (pid {process.pid})")
+        return process
+
+    async def start(self):
+        self.sockets = [self.http_event_service.uvicorn_config.bind_socket()]
+        self.processes = [self.spawn_worker(index) for index in range(self.worker_count)]
+
+        while True:
+            await asyncio.sleep(self.MONITOR_INTERVAL)
+            for index, process in enumerate(self.processes):
+                if not process.is_alive():
+                    self.logger.warning(f"HTTP worker {process.name} (pid {process.pid}) exited with code {process.exitcode}, restarting")
+                    self.processes[index] = self.spawn_worker(index)
+
+    async def stop(self):
+        for process in self.processes:
+            if process.is_alive():
+                process.terminate()
+
+        for process in self.processes:
+            await asyncio.to_thread(process.join, self.STOP_TIMEOUT)
+            if process.is_alive():
+                self.logger.warning(f"HTTP worker {process.name} (pid {process.pid}) did not stop in time, killing")
+                process.kill()
+                await asyncio.to_thread(process.join)
+
+        for sock in self.sockets:
+            sock.close()
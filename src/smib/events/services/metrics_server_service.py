@@ -0,0 +1,38 @@
+import logging
+from logging import Logger
+
+from starlette.applications import Starlette
+from starlette.routing import Route
+from uvicorn import Config, Server
+
+from smib.config import webserver, logging as logging_config
+from smib.logging_ import get_logging_config
+from smib.metrics.exposition import METRICS_PATH, metrics_endpoint
+
+
+class MetricsServerService:
+    """
+    Serves this process's metrics on a port of its own. With HTTP workers, the leader serves nothing on the shared
+    webserver socket, but it is the process running the Slack listeners and scheduled jobs (and their MongoDB and Slack
+    Web API calls), so their metrics are scraped from here.
+    """
+
+    def __init__(self, port: int):
+        self.port: int = port
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+        app = Starlette(routes=[Route(METRICS_PATH, metrics_endpoint, methods=["GET"])])
+        self.server: Server = Server(Config(app,
+            host=webserver.host,
+            port=port,
+            log_config=get_logging_config(logging_config.log_level),
+            access_log=False,
+            lifespan="off",
+        ))
+
+    async def start(self):
+        self.logger.info(f"Serving metrics on port {self.port} at {METRICS_PATH}")
+        await self.server.serve()
+
+    async def stop(self):
+        if self.server.started:
+            await self.server.shutdown()
@@ -0,0 +1,75 @@
+import asyncio
+import gc
+import logging
+import os
+import resource
+import tracemalloc
+from logging import Logger
+
+from smib.metrics import get_metrics_registry
+
+
+class ProcessMetricsService:
+    """
+    Periodically samples the memory use of this process (resident set size, garbage collector activity, live asyncio
+    tasks and, while tracemalloc is tracing, the traced heap), so growth shows up on /metrics long before the container
+    is killed for running out of memory.
+    """
+    SAMPLE_INTERVAL: float = 15
+
+    STATM_PATH: str = "/proc/self/statm"
+
+    def __init__(self):
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+        self.page_size: int = os.sysconf("SC_PAGE_SIZE")
+
+        registry = get_metrics_registry()
+        self.resident_memory = registry.gauge("process_resident_memory_bytes", "Resident memory size in bytes").labels()
+        self.peak_resident_memory = registry.gauge("process_peak_resident_memory_bytes", "Peak resident memory size in bytes").labels()
+        self.asyncio_tasks = registry.gauge("smib_asyncio_tasks", "Live asyncio tasks").labels()
+        self.gc_collections = registry.counter("python_gc_collections", "Garbage collections run, by generation", ("generation",))
+        self.gc_uncollectable = registry.counter("python_gc_uncollectable_objects", "Uncollectable objects found by the garbage collector, by generation", ("generation",))
+        self.traced_memory = registry.gauge("python_tracemalloc_traced_bytes", "Memory traced by tracemalloc in bytes, 0 when not tracing").labels()
+        self.peak_traced_memory = registry.gauge("python_tracemalloc_peak_traced_bytes", "Peak memory traced by tracemalloc in bytes, 0 when not tracing").labels()
+
+    def get_resident_memory(self) -> int | None:
+        try:
+            with open(self.STATM_PATH) as statm:
+                return int(statm.read().split()[1]) * self.page_size
+        except (OSError, IndexError, ValueError):
+            return None
+
+    def sample(self) -> None:
+        if (resident_memory := self.get_resident_memory()) is not None:
+            self.resident_memory.set(resident_memory)
+        # ru_maxrss is in KiB on Linux
+        self.peak_resident_memory.set(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024)
+        self.asyncio_tasks.set(len(asyncio.all_tasks()))
+
+        # The garbage collector keeps running totals, the counters are brought up to them
+        for generation, stats in enumerate(gc.get_stats()):
+            collections, uncollectable = self.gc_collections.labels(generation), self.gc_uncollectable.labels(generation)
+            collections.inc(stats["collections"] - collections.value)
+            uncollectable.inc(stats["uncollectable"] - uncollectable.value)
+
+        traced, peak_traced = tracemalloc.get_traced_memory()
+        self.traced_memory.set(traced)
+        self.peak_traced_memory.set(peak_traced)
+
+        self.logger.debug(
+            f"RSS: {self.resident_memory.value / 2 ** 20:.1f}MiB, "
+            f"peak RSS: {self.peak_resident_memory.value / 2 ** 20:.1f}MiB, "
+            f"asyncio tasks: {self.asyncio_tasks.value}, "
+            f"traced: {traced / 2 ** 20:.1f}MiB"
+        )
+
+    async def start(self):
+        while True:
+            try:
+                self.sample()
+            except Exception as e:
+                self.logger.exception(f"Failed to sample process metrics: {repr(e)}")
+            await asyncio.sleep(self.SAMPLE_INTERVAL)
+
+    async def stop(self):
+        pass
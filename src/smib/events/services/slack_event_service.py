@@ -8,6 +8,7 @@ from slack_bolt.adapter.socket_mode.aiohttp import AsyncSocketModeHandler
 from slack_bolt.app.async_app import AsyncApp
 
 from smib.config import slack
+from smib.tracing.slack import TracingAsyncSocketModeHandler
 
 
 class SlackEventService:
@@ -18,7 +19,7 @@ class SlackEventService:
     @property
     @lru_cache(maxsize=1)
     def service(self) -> AsyncSocketModeHandler:
-        service = AsyncSocketModeHandler(self.bolt_app, app_token=slack.app_token.get_secret_value(), logger=logging.getLogger("slack_bolt.AsyncSocketModeHandler"))
+        service = TracingAsyncSocketModeHandler(self.bolt_app, app_token=slack.app_token.get_secret_value(), logger=logging.getLogger("slack_bolt.AsyncSocketModeHandler"))
         service.client.on_message_listeners.append(self.log_number_of_connections)
         return service
 
@@ -0,0 +1,38 @@
+import asyncio
+import logging
+from logging import Logger
+
+from smib.tracing import Tracer
+
+
+class TracingService:
+    """ Hands the spans finished since the last export to the tracer's exporter, off the event loop, every few seconds """
+    EXPORT_INTERVAL: float = 5
+
+    def __init__(self, tracer: Tracer):
+        self.tracer: Tracer = tracer
+        self.logger: Logger = logging.getLogger(self.__class__.__name__)
+        self._reported_dropped_spans: int = 0
+
+    async def export(self) -> None:
+        if self.tracer.dropped_spans > self._reported_dropped_spans:
+            self.logger.warning(f"Dropped {self.tracer.dropped_spans - self._reported_dropped_spans} span(s), the export queue was full")
+            self._reported_dropped_spans = self.tracer.dropped_spans
+
+        if spans := self.tracer.drain():
+            await asyncio.to_thread(self.tracer.exporter.export, spans)
+            self.logger.debug(f"Exported {len(spans)} span(s)")
+
+    async def start(self):
+        while True:
+            await asyncio.sleep(self.EXPORT_INTERVAL)
+            try:
+                await self.export()
+            except Exception as e:
+                self.logger.exception(f"Failed to export spans: {repr(e)}")
+
+    async def stop(self):
+        try:
+            await self.export()
+        finally:
+            self.tracer.exporter.shutdown()
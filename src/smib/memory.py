@@ -0,0 +1,131 @@
+import tracemalloc
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, UTC
+from typing import Callable
+
+
+@dataclass(frozen=True, slots=True)
+class NamedSnapshot:
+    name: str
+    taken_at: datetime
+    snapshot: tracemalloc.Snapshot
+    traced_bytes: int
+
+
+class MemoryTracker:
+    """
+    Takes named tracemalloc snapshots of this process and diffs them, so memory growth between two points in time can
+    be pinned to the files (and plugins) that allocated it. Tracing slows every allocation down, so it is only ever
+    started on demand.
+
+    owner: Callable taking a source filename, returning the name of the plugin it belongs to (or None)
+    """
+    MAX_SNAPSHOTS: int = 8
+
+    # Allocations made by tracemalloc and the import machinery are noise when looking for leaks
+    SNAPSHOT_FILTERS: tuple[tracemalloc.Filter, ...] = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+
+    def __init__(self, owner: Callable[[str], str | None]):
+        self.owner: Callable[[str], str | None] = owner
+        self.snapshots: OrderedDict[str, NamedSnapshot] = OrderedDict()
+
+    @property
+    def is_tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = 1) -> None:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def stop(self) -> None:
+        """ Stops tracing, which also frees every snapshot taken so far """
+        tracemalloc.stop()
+        self.snapshots.clear()
+
+    def take_snapshot(self, name: str) -> NamedSnapshot:
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not tracing, start it first")
+
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.SNAPSHOT_FILTERS)
+        named_snapshot = NamedSnapshot(
+            name=name,
+            taken_at=datetime.now(UTC),
+            snapshot=snapshot,
+            traced_bytes=sum(trace.size for trace in snapshot.traces),
+        )
+
+        self.snapshots.pop(name, None)
+        self.snapshots[name] = named_snapshot
+        while len(self.snapshots) > self.MAX_SNAPSHOTS:
+            self.snapshots.popitem(last=False)
+        return named_snapshot
+
+    def get_owner(self, filename: str) -> str:
+        return self.owner(filename) or "smib"
+
+    def diff(self, old_name: str, new_name: str, top: int = 20) -> dict:
+        """ Allocation growth from one snapshot to another, by line, by file and by plugin. Raises KeyError for unknown snapshots """
+        old, new = self.snapshots[old_name], self.snapshots[new_name]
+
+        line_diffs = new.snapshot.compare_to(old.snapshot, "lineno")
+        file_diffs = new.snapshot.compare_to(old.snapshot, "filename")
+
+        plugin_size_diffs: Counter[str] = Counter()
+        plugin_count_diffs: Counter[str] = Counter()
+        for file_diff in file_diffs:
+            owner = self.get_owner(file_diff.traceback[0].filename)
+            plugin_size_diffs[owner] += file_diff.size_diff
+            plugin_count_diffs[owner] += file_diff.count_diff
+
+        def largest(diffs: list[tracemalloc.StatisticDiff]) -> list[tracemalloc.StatisticDiff]:
+            return sorted(diffs, key=lambda diff: abs(diff.size_diff), reverse=True)[:top]
+
+        return {
+            "from": old_name,
+            "to": new_name,
+            "seconds": round((new.taken_at - old.taken_at).total_seconds(), 3),
+            "traced_bytes_diff": new.traced_bytes - old.traced_bytes,
+            "top_lines": [
+                {
+                    "line": f"{diff.traceback[0].filename}:{diff.traceback[0].lineno}",
+                    "size_diff": diff.size_diff,
+                    "count_diff": diff.count_diff,
+                    "size": diff.size,
+                }
+                for diff in largest(line_diffs)
+            ],
+            "files": [
+                {
+                    "file": diff.traceback[0].filename,
+                    "plugin": self.get_owner(diff.traceback[0].filename),
+                    "size_diff": diff.size_diff,
+                    "count_diff": diff.count_diff,
+                    "size": diff.size,
+                }
+                for diff in largest(file_diffs)
+            ],
+            "plugins": {
+                owner: {"size_diff": size_diff, "count_diff": plugin_count_diffs[owner]}
+                for owner, size_diff in sorted(plugin_size_diffs.items(), key=lambda item: abs(item[1]), reverse=True)
+            },
+        }
+
+    @property
+    def stats(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": tracemalloc.is_tracing(),
+            "traceback_frames": tracemalloc.get_traceback_limit(),
+            "traced_bytes": current,
+            "peak_traced_bytes": peak,
+            "snapshots": [
+                {"name": snapshot.name, "taken_at": snapshot.taken_at.isoformat(), "traced_bytes": snapshot.traced_bytes}
+                for snapshot in self.snapshots.values()
+            ],
+        }
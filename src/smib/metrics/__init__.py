@@ -0,0 +1,17 @@
+from smib.metrics.registry import MetricsRegistry, Counter, Gauge, Histogram, get_metrics_registry
+from smib.plugins.lifecycle_manager import get_registering_plugin
+
+__all__ = [
+    "MetricsRegistry",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "get_metrics_registry",
+    "get_plugin_label",
+]
+
+
+def get_plugin_label() -> str:
+    """ Label for listeners being declared right now: the registering plugin, or smib for core listeners """
+    plugin = get_registering_plugin()
+    return plugin.unique_name if plugin else "smib"
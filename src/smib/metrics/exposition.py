@@ -0,0 +1,18 @@
+from fastapi import FastAPI
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Route
+
+from smib.metrics.registry import get_metrics_registry
+
+METRICS_PATH: str = "/metrics"
+CONTENT_TYPE: str = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def metrics_endpoint(request: Request) -> Response:
+    return Response(get_metrics_registry().render(), headers={"content-type": CONTENT_TYPE})
+
+
+def mount_metrics_route(fastapi_app: FastAPI) -> None:
+    # A plain Starlette route ahead of every plugin route, so scrapes never go through Bolt
+    fastapi_app.router.routes[0:0] = [Route(METRICS_PATH, metrics_endpoint, methods=["GET"], include_in_schema=False)]
@@ -0,0 +1,26 @@
+from pymongo.monitoring import CommandListener, CommandStartedEvent, CommandSucceededEvent, CommandFailedEvent
+
+from smib.metrics.registry import get_metrics_registry
+from smib.metrics.server_timing import record_span
+
+MONGO_COMMAND_DURATION = get_metrics_registry().histogram(
+    "smib_mongo_command_duration_seconds", "Time taken by MongoDB commands, as reported by the driver", ("command",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+MONGO_COMMAND_FAILURES = get_metrics_registry().counter(
+    "smib_mongo_command_failures", "MongoDB commands that failed", ("command",))
+
+
+class MongoCommandMetricsListener(CommandListener):
+    """ Pass to the MongoDB client in event_listeners to record the latency of every command """
+
+    def started(self, event: CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        MONGO_COMMAND_DURATION.labels(event.command_name).observe(event.duration_micros / 1_000_000)
+        record_span("mongo", event.duration_micros / 1_000_000)
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        MONGO_COMMAND_DURATION.labels(event.command_name).observe(event.duration_micros / 1_000_000)
+        record_span("mongo", event.duration_micros / 1_000_000)
+        MONGO_COMMAND_FAILURES.labels(event.command_name).inc()
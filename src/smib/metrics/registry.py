@@ -0,0 +1,188 @@
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Iterator, Generic, TypeVar
+
+DEFAULT_BUCKETS: tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float("inf"))
+
+ChildT = TypeVar("ChildT")
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{escape_label_value(value)}"' for name, value in labels.items()) + "}"
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class CounterChild:
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+
+class GaugeChild:
+    def __init__(self):
+        self.value: float = 0
+
+    def inc(self, amount: float = 1) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1) -> None:
+        self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    @contextmanager
+    def track_in_progress(self) -> Iterator[None]:
+        self.inc()
+        try:
+            yield
+        finally:
+            self.dec()
+
+
+class HistogramChild:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets: tuple[float, ...] = buckets
+        self.counts: list[int] = [0] * len(buckets)
+        self.sum: float = 0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        for index, bucket in enumerate(self.buckets):
+            if value <= bucket:
+                self.counts[index] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+
+class Metric(ABC, Generic[ChildT]):
+    type: str
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        self.name: str = name
+        self.documentation: str = documentation
+        self.labelnames: tuple[str, ...] = labelnames
+        self._children: dict[tuple[str, ...], ChildT] = {}
+
+    @abstractmethod
+    def _create_child(self) -> ChildT:
+        ...
+
+    def labels(self, *labelvalues: str) -> ChildT:
+        """ The child for these label values, in labelnames order. Callers on hot paths should keep hold of it """
+        if len(labelvalues) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {labelvalues}")
+        labelvalues = tuple(str(value) for value in labelvalues)
+        if (child := self._children.get(labelvalues)) is None:
+            child = self._children[labelvalues] = self._create_child()
+        return child
+
+    def samples(self, labels: dict[str, str], child: ChildT) -> Iterator[str]:
+        yield f"{self.name}{format_labels(labels)} {format_value(child.value)}"
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.type}"
+        for labelvalues, child in self._children.items():
+            yield from self.samples(dict(zip(self.labelnames, labelvalues)), child)
+
+
+class Counter(Metric[CounterChild]):
+    type = "counter"
+
+    def _create_child(self) -> CounterChild:
+        return CounterChild()
+
+    def samples(self, labels: dict[str, str], child: CounterChild) -> Iterator[str]:
+        yield f"{self.name}_total{format_labels(labels)} {format_value(child.value)}"
+
+
+class Gauge(Metric[GaugeChild]):
+    type = "gauge"
+
+    def _create_child(self) -> GaugeChild:
+        return GaugeChild()
+
+
+class Histogram(Metric[HistogramChild]):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets: tuple[float, ...] = buckets if buckets[-1] == float("inf") else (*buckets, float("inf"))
+
+    def _create_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def samples(self, labels: dict[str, str], child: HistogramChild) -> Iterator[str]:
+        cumulative_count = 0
+        for bucket, count in zip(child.buckets, child.counts):
+            cumulative_count += count
+            yield f"{self.name}_bucket{format_labels({**labels, 'le': format_value(bucket)})} {cumulative_count}"
+        yield f"{self.name}_sum{format_labels(labels)} {format_value(child.sum)}"
+        yield f"{self.name}_count{format_labels(labels)} {child.count}"
+
+
+MetricT = TypeVar("MetricT", bound=Metric)
+
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics, rendered in the Prometheus text exposition format.
+    Metrics are only ever updated from the event loop thread, so no locking is done.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def _get_or_create(self, metric_class: type[MetricT], name: str, *args, **kwargs) -> MetricT:
+        if (metric := self._metrics.get(name)) is None:
+            metric = self._metrics[name] = metric_class(name, *args, **kwargs)
+        elif not isinstance(metric, metric_class):
+            raise ValueError(f"Metric {name} is already registered as a {metric.type}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: tuple[str, ...] = (), buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_metrics_registry: MetricsRegistry = MetricsRegistry()
+
+
+def get_metrics_registry() -> MetricsRegistry:
+    return _metrics_registry
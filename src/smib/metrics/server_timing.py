@@ -0,0 +1,54 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+class RequestTimings:
+    """ Time spent in each stage of handling one request, summed per stage """
+
+    def __init__(self):
+        self.start: float = time.perf_counter()
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+
+    def record(self, name: str, duration: float) -> None:
+        self.durations[name] = self.durations.get(name, 0) + duration
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def to_header(self) -> str:
+        """ Server-Timing header value, durations in milliseconds, with the total time elapsed so far """
+        metrics = [
+            f'{name};dur={duration * 1000:.3f}' + (f';desc="{self.counts[name]} calls"' if self.counts[name] > 1 else "")
+            for name, duration in self.durations.items()
+        ]
+        metrics.append(f"total;dur={(time.perf_counter() - self.start) * 1000:.3f}")
+        return ", ".join(metrics)
+
+
+_request_timings: ContextVar[RequestTimings | None] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings() -> RequestTimings:
+    """ Start collecting timings for the current request; everything it awaits (in the same context) records into it """
+    request_timings = RequestTimings()
+    _request_timings.set(request_timings)
+    return request_timings
+
+
+def record_span(name: str, duration: float) -> None:
+    if (request_timings := _request_timings.get()) is not None:
+        request_timings.record(name, duration)
+
+
+@contextmanager
+def timing_span(name: str) -> Iterator[None]:
+    if (request_timings := _request_timings.get()) is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        request_timings.record(name, time.perf_counter() - start)
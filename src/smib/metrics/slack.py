@@ -0,0 +1,119 @@
+import sys
+import time
+from functools import wraps
+from types import SimpleNamespace
+from typing import Callable
+
+from aiohttp import ClientSession, TraceConfig, TraceRequestStartParams, TraceRequestEndParams, TraceRequestExceptionParams
+from slack_bolt.app.async_app import AsyncApp
+from slack_bolt.listener.async_listener import AsyncListener
+
+from smib.events.dispatcher import get_listener_registry
+from smib.metrics.registry import get_metrics_registry
+from smib.metrics.server_timing import record_span
+from smib.plugins.lifecycle_manager import PluginLifecycleManager
+from smib.tracing import start_span
+from smib.tracing.slack import create_slack_web_api_trace_config
+
+SLACK_LISTENER_DURATION = get_metrics_registry().histogram(
+    "smib_slack_listener_duration_seconds", "Time taken by Slack listeners", ("plugin", "listener"))
+SLACK_LISTENER_ERRORS = get_metrics_registry().counter(
+    "smib_slack_listener_errors", "Slack listeners that raised an exception", ("plugin", "listener"))
+SLACK_WEB_API_CALLS = get_metrics_registry().counter(
+    "smib_slack_web_api_calls", "Calls made to the Slack Web API, by method and HTTP status (error if no response)", ("method", "status"))
+
+
+def get_slack_api_method(params: TraceRequestEndParams | TraceRequestExceptionParams) -> str:
+    # e.g. https://slack.com/api/chat.postMessage
+    return params.url.path.rsplit("/", 1)[-1]
+
+
+async def on_slack_request_start(session: ClientSession, context: SimpleNamespace, params: TraceRequestStartParams) -> None:
+    context.start = time.perf_counter()
+
+
+async def on_slack_request_end(session: ClientSession, context: SimpleNamespace, params: TraceRequestEndParams) -> None:
+    SLACK_WEB_API_CALLS.labels(get_slack_api_method(params), params.response.status).inc()
+    record_span("slack-api", time.perf_counter() - context.start)
+
+
+async def on_slack_request_exception(session: ClientSession, context: SimpleNamespace, params: TraceRequestExceptionParams) -> None:
+    SLACK_WEB_API_CALLS.labels(get_slack_api_method(params), "error").inc()
+    record_span("slack-api", time.perf_counter() - context.start)
+
+
+class SharedClientSession:
+    """
+    The session the Bolt web client makes its requests through, wrapping an aiohttp ClientSession.
+    Bolt deep copies the request context, including the web client and so its session, for every lazy listener.
+    A ClientSession cannot be copied, and is meant to be shared anyway, so copies of this are itself.
+    """
+
+    def __init__(self, session: ClientSession):
+        self.session: ClientSession = session
+
+    @property
+    def closed(self) -> bool:
+        return self.session.closed
+
+    def request(self, method: str, url: str, **kwargs):
+        return self.session.request(method, url, **kwargs)
+
+    async def close(self) -> None:
+        await self.session.close()
+
+    def __copy__(self) -> "SharedClientSession":
+        return self
+
+    def __deepcopy__(self, memo) -> "SharedClientSession":
+        return self
+
+
+def create_slack_web_api_session() -> SharedClientSession:
+    """ Shared session for the Bolt web client, counting (and tracing) every Slack Web API call """
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(on_slack_request_start)
+    trace_config.on_request_end.append(on_slack_request_end)
+    trace_config.on_request_exception.append(on_slack_request_exception)
+    return SharedClientSession(ClientSession(trace_configs=[trace_config, create_slack_web_api_trace_config()]))
+
+
+def instrument_slack_listener(listener: AsyncListener, plugin_label: str) -> None:
+    listener_label = getattr(listener.ack_function, "__qualname__", repr(listener.ack_function))
+    listener_duration = SLACK_LISTENER_DURATION.labels(plugin_label, listener_label)
+    listener_errors = SLACK_LISTENER_ERRORS.labels(plugin_label, listener_label)
+    span_attributes = {"smib.plugin": plugin_label}
+    run_ack_function = listener.run_ack_function
+
+    @wraps(run_ack_function)
+    async def instrumented_run_ack_function(**kwargs):
+        start = time.perf_counter()
+        try:
+            with start_span(f"listener {listener_label}", attributes=span_attributes):
+                return await run_ack_function(**kwargs)
+        except Exception:
+            listener_errors.inc()
+            raise
+        finally:
+            listener_duration.observe(time.perf_counter() - start)
+
+    listener.run_ack_function = instrumented_run_ack_function
+    listener.lazy_functions = [trace_lazy_function(lazy_function, span_attributes) for lazy_function in listener.lazy_functions]
+
+
+def trace_lazy_function(lazy_function: Callable, span_attributes: dict[str, str]) -> Callable:
+    # Bolt reads the arguments to pass from the signature, which inspect finds through __wrapped__
+    @wraps(lazy_function)
+    async def traced_lazy_function(*args, **kwargs):
+        with start_span(f"lazy listener {lazy_function.__qualname__}", attributes=span_attributes):
+            return await lazy_function(*args, **kwargs)
+
+    return traced_lazy_function
+
+
+def instrument_slack_listeners(bolt_app: AsyncApp, plugin_lifecycle_manager: PluginLifecycleManager) -> None:
+    """ Records the latency and errors of every Slack listener registered so far, labelled by the plugin it belongs to """
+    for listener in get_listener_registry(bolt_app).slack_listeners:
+        module = sys.modules.get(getattr(listener.ack_function, "__module__", ""), None)
+        plugin = plugin_lifecycle_manager.find_plugin_by_path(module.__file__) if module and getattr(module, "__file__", None) else None
+        instrument_slack_listener(listener, plugin.unique_name if plugin else "smib")
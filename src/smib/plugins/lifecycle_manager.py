@@ -10,6 +10,13 @@ from smib.config import general
 from smib.plugins.loaders import PluginLoader, create_default_plugin_loader
 from smib.plugins.plugin import Plugin
 
+_registering_plugin: Plugin | None = None
+
+
+def get_registering_plugin() -> Plugin | None:
+    """Get the plugin whose register function is currently running, if any."""
+    return _registering_plugin
+
 
 class PluginLifecycleManager:
     def __init__(self, bolt_app: AsyncApp, plugin_loader: Optional[PluginLoader] = None):
@@ -25,6 +32,7 @@ class PluginLifecycleManager:
         self.plugin_preregister_callbacks: list[callable] = []
         self.plugin_postregister_callbacks: list[callable] = []
         self.registration_parameters: dict[str, any] = {}
+        self._plugin_names_by_path: dict[str, str | None] = {}
 
     def load_plugins(self):
         self.logger.info(f"Resolved plugins directory to {self.plugins_directory}")
@@ -60,13 +68,17 @@ class PluginLifecycleManager:
         self.logger.info(f"Registered {len(self.plugins)} plugin(s) ({self.plugin_string})")
 
     def register_plugin(self, plugin: Plugin):
+        global _registering_plugin
+        _registering_plugin = plugin
         try:
             plugin.register(**self.registration_parameters)
         except Exception as e:
             raise
         finally:
+            _registering_plugin = None
             self.plugins.append(plugin)
             self._add_to_map(plugin)
+            self._plugin_names_by_path.clear()
 
     @staticmethod
     def _get_map_key(plugin: Plugin):
@@ -89,6 +101,7 @@ class PluginLifecycleManager:
 
         self.plugins.remove(plugin)
         self._remove_from_map(plugin)
+        self._plugin_names_by_path.clear()
 
     def preregister_plugin(self, plugin: Plugin):
         for preregister_callback in self.plugin_preregister_callbacks:
@@ -153,6 +166,24 @@ class PluginLifecycleManager:
             # If the path is not relative to the plugins directory, return the path itself
             return path
 
+    def find_plugin_by_path(self, path: Path | str) -> Plugin | None:
+        """Find the registered plugin a source file belongs to."""
+        path = Path(path).resolve()
+        for plugin in self.plugins:
+            module_path = Path(plugin.module.__file__)
+            if module_path.name == "__init__.py":
+                module_path = module_path.parent
+            if path.is_relative_to(module_path.resolve()):
+                return plugin
+        return None
+
+    def find_plugin_name_by_path(self, filename: str) -> str | None:
+        """Unique name of the registered plugin a source file belongs to, cached per file for profiling every frame."""
+        if filename not in self._plugin_names_by_path:
+            plugin = self.find_plugin_by_path(filename) if filename.endswith(".py") else None
+            self._plugin_names_by_path[filename] = plugin.unique_name if plugin else None
+        return self._plugin_names_by_path[filename]
+
     def unload_plugins(self):
         self.logger.info(f"Unloading {len(self.plugins)} plugin(s) ({self.plugin_string})")
         for plugin in self.plugins[::]:
@@ -0,0 +1,33 @@
+from enum import StrEnum
+
+
+class ProcessRole(StrEnum):
+    STANDALONE = 'standalone'
+    LEADER = 'leader'
+    HTTP_WORKER = 'http_worker'
+
+    @property
+    def serves_http(self) -> bool:
+        return self in (ProcessRole.STANDALONE, ProcessRole.HTTP_WORKER)
+
+    @property
+    def runs_slack_and_scheduler(self) -> bool:
+        return self in (ProcessRole.STANDALONE, ProcessRole.LEADER)
+
+
+_process_role: ProcessRole = ProcessRole.STANDALONE
+
+
+def get_process_role() -> ProcessRole:
+    """Get the role of the current process (standalone unless running with multiple HTTP workers)."""
+    return _process_role
+
+
+def set_process_role(role: ProcessRole) -> None:
+    global _process_role
+    _process_role = role
+
+
+def is_leader_process() -> bool:
+    """Whether this process runs Slack socket mode and the scheduler."""
+    return _process_role.runs_slack_and_scheduler
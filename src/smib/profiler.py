@@ -0,0 +1,150 @@
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from types import FrameType
+from typing import Callable
+
+FrameKey = tuple[str, str, int]
+Stack = tuple[FrameKey, ...]
+
+
+@dataclass
+class ThreadSamples:
+    name: str
+    stacks: list[Stack] = field(default_factory=list)
+    weights: list[float] = field(default_factory=list)
+
+
+class SamplingProfiler:
+    """
+    In-process sampling profiler. A background thread captures the stack of every other thread (including the one
+    running the event loop) at a fixed interval, which is cheap enough to run against a live process.
+
+    owner: Callable taking a source filename, returning the name of the plugin it belongs to (or None). Called for every
+    frame, so it should be cached, e.g. PluginLifecycleManager.find_plugin_name_by_path
+    """
+    DEFAULT_INTERVAL: float = 0.005
+
+    def __init__(self, owner: Callable[[str], str | None], interval: float = DEFAULT_INTERVAL):
+        self.owner: Callable[[str], str | None] = owner
+        self.interval: float = interval
+        self.threads: dict[int, ThreadSamples] = {}
+        self.duration: float = 0
+
+    @staticmethod
+    def get_stack(frame: FrameType | None) -> Stack:
+        stack: list[FrameKey] = []
+        while frame is not None:
+            code = frame.f_code
+            stack.append((code.co_filename, code.co_qualname, code.co_firstlineno))
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def run(self, seconds: float) -> None:
+        """ Samples for the given number of seconds, blocking the calling thread """
+        own_thread_id = threading.get_ident()
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+
+        start = last_sample = time.perf_counter()
+        end = start + seconds
+        while (now := time.perf_counter()) < end:
+            weight, last_sample = now - last_sample, now
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread_id:
+                    continue
+                if thread_id not in self.threads:
+                    self.threads[thread_id] = ThreadSamples(thread_names.get(thread_id, str(thread_id)))
+                self.threads[thread_id].stacks.append(self.get_stack(frame))
+                self.threads[thread_id].weights.append(weight)
+            time.sleep(self.interval)
+        self.duration = time.perf_counter() - start
+
+    @staticmethod
+    def format_frame(frame: FrameKey) -> str:
+        filename, qualname, line = frame
+        return f"{qualname} ({filename}:{line})"
+
+    def to_collapsed(self) -> str:
+        """ Collapsed stacks (thread;root;...;leaf count), as read by flamegraph.pl, speedscope and most other viewers """
+        collapsed: Counter[str] = Counter()
+        for samples in self.threads.values():
+            for stack in samples.stacks:
+                collapsed[";".join((samples.name, *(self.format_frame(frame) for frame in stack)))] += 1
+        return "\n".join(f"{stack} {count}" for stack, count in collapsed.most_common()) + "\n"
+
+    def to_speedscope(self) -> dict:
+        """ Speedscope file format (https://www.speedscope.app), one sampled profile per thread """
+        frame_indexes: dict[FrameKey, int] = {}
+        frames: list[dict] = []
+
+        def frame_index(frame: FrameKey) -> int:
+            if frame not in frame_indexes:
+                frame_indexes[frame] = len(frames)
+                filename, qualname, line = frame
+                frames.append({"name": qualname, "file": filename, "line": line})
+            return frame_indexes[frame]
+
+        profiles = [
+            {
+                "type": "sampled",
+                "name": samples.name,
+                "unit": "seconds",
+                "startValue": 0,
+                "endValue": sum(samples.weights),
+                "samples": [[frame_index(frame) for frame in stack] for stack in samples.stacks],
+                "weights": samples.weights,
+            }
+            for samples in self.threads.values()
+        ]
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": "S.M.I.B. profile",
+            "exporter": "smib",
+            "shared": {"frames": frames},
+            "profiles": profiles,
+        }
+
+    def summary(self, top: int = 20) -> dict:
+        """ Most sampled frames, and samples per plugin (attributed to the innermost plugin frame on each stack) """
+        sample_count = sum(len(samples.stacks) for samples in self.threads.values())
+        self_frames: Counter[FrameKey] = Counter()
+        plugins: Counter[str] = Counter()
+        plugin_frames: dict[str, Counter[FrameKey]] = {}
+
+        for samples in self.threads.values():
+            for stack in samples.stacks:
+                if not stack:
+                    continue
+                self_frames[stack[-1]] += 1
+                for frame in reversed(stack):
+                    if (owner := self.owner(frame[0])) is not None:
+                        plugins[owner] += 1
+                        plugin_frames.setdefault(owner, Counter())[frame] += 1
+                        break
+
+        def percent(count: int) -> float:
+            return round(count / sample_count * 100, 2) if sample_count else 0
+
+        return {
+            "duration_seconds": round(self.duration, 3),
+            "samples": sample_count,
+            "threads": {samples.name: len(samples.stacks) for samples in self.threads.values()},
+            "top_frames": [
+                {"frame": self.format_frame(frame), "samples": count, "percent": percent(count)}
+                for frame, count in self_frames.most_common(top)
+            ],
+            "plugins": {
+                owner: {
+                    "samples": count,
+                    "percent": percent(count),
+                    "top_frames": [
+                        {"frame": self.format_frame(frame), "samples": frame_count}
+                        for frame, frame_count in plugin_frames[owner].most_common(5)
+                    ],
+                }
+                for owner, count in plugins.most_common()
+            },
+        }
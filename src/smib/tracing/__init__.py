@@ -0,0 +1,15 @@
+from smib.tracing.tracer import Span, SpanContext, SpanKind, StatusCode, SpanExporter, Tracer, get_tracer, \
+    get_current_span, start_span, parse_traceparent
+
+__all__ = [
+    "Span",
+    "SpanContext",
+    "SpanKind",
+    "StatusCode",
+    "SpanExporter",
+    "Tracer",
+    "get_tracer",
+    "get_current_span",
+    "start_span",
+    "parse_traceparent",
+]
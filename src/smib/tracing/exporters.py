@@ -0,0 +1,83 @@
+import json
+import os
+from pathlib import Path
+from typing import Sequence
+
+from smib.tracing.tracer import Span, AttributeValue
+
+
+def to_otlp_attributes(attributes: dict[str, AttributeValue]) -> list[dict]:
+    otlp_attributes: list[dict] = []
+    for key, value in attributes.items():
+        # bool first, it is also an int. OTLP JSON encodes 64-bit ints as strings
+        if isinstance(value, bool):
+            otlp_value = {"boolValue": value}
+        elif isinstance(value, int):
+            otlp_value = {"intValue": str(value)}
+        elif isinstance(value, float):
+            otlp_value = {"doubleValue": value}
+        else:
+            otlp_value = {"stringValue": str(value)}
+        otlp_attributes.append({"key": key, "value": otlp_value})
+    return otlp_attributes
+
+
+def to_otlp_span(span: Span) -> dict:
+    otlp_span = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        "startTimeUnixNano": str(span.start_time_ns),
+        "endTimeUnixNano": str(span.end_time_ns),
+        "attributes": to_otlp_attributes(span.attributes),
+        "status": {"code": int(span.status)},
+    }
+    if span.parent_span_id is not None:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    if span.status_message is not None:
+        otlp_span["status"]["message"] = span.status_message
+    if span.events:
+        otlp_span["events"] = [
+            {"timeUnixNano": str(event.time_ns), "name": event.name, "attributes": to_otlp_attributes(event.attributes)}
+            for event in span.events
+        ]
+    return otlp_span
+
+
+def to_otlp_json(spans: Sequence[Span], resource: dict[str, AttributeValue]) -> dict:
+    """ An OTLP/JSON ExportTraceServiceRequest """
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": to_otlp_attributes(resource)},
+            "scopeSpans": [{
+                "scope": {"name": "smib"},
+                "spans": [to_otlp_span(span) for span in spans],
+            }],
+        }]
+    }
+
+
+class OtlpJsonFileExporter:
+    """
+    Appends each batch of spans to a file as one OTLP/JSON export request per line - the format of the OpenTelemetry
+    Collector's file exporter, so it can be replayed into any OTLP backend (e.g. with the otlpjsonfile receiver) or
+    read directly, and needs no collector running alongside SMIB.
+    """
+
+    def __init__(self, path: Path, resource: dict[str, AttributeValue]):
+        self.path: Path = path
+        self.resource: dict[str, AttributeValue] = resource
+
+    def export(self, spans: Sequence[Span]) -> None:
+        line = json.dumps(to_otlp_json(spans, self.resource), separators=(",", ":")) + "\n"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A single append per batch, so batches from several worker processes sharing the file do not interleave
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode())
+        finally:
+            os.close(fd)
+
+    def shutdown(self) -> None:
+        pass
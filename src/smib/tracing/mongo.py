@@ -0,0 +1,44 @@
+from pymongo.monitoring import CommandListener, CommandStartedEvent, CommandSucceededEvent, CommandFailedEvent
+
+from smib.tracing.tracer import Span, SpanKind, StatusCode, get_tracer, get_current_span
+
+
+class MongoCommandTracingListener(CommandListener):
+    """
+    Pass to the MongoDB client in event_listeners to record a client span for every command made within a trace.
+    The async client publishes command events from the task awaiting the command, so the current span is its parent.
+    """
+
+    def __init__(self):
+        self.spans: dict[tuple, Span] = {}
+
+    @staticmethod
+    def get_key(event: CommandStartedEvent | CommandSucceededEvent | CommandFailedEvent) -> tuple:
+        return event.connection_id, event.request_id
+
+    def started(self, event: CommandStartedEvent) -> None:
+        if get_current_span() is None:
+            return
+
+        host, port = event.connection_id
+        span = get_tracer().start_span(f"mongo {event.command_name}", SpanKind.CLIENT, {
+            "db.system": "mongodb",
+            "db.operation.name": event.command_name,
+            "db.namespace": event.database_name,
+            "server.address": host,
+        })
+        # e.g. {"find": "space_state", ...}
+        if isinstance(collection := event.command.get(event.command_name), str):
+            span.set_attribute("db.collection.name", collection)
+        if port is not None:
+            span.set_attribute("server.port", port)
+        self.spans[self.get_key(event)] = span
+
+    def succeeded(self, event: CommandSucceededEvent) -> None:
+        if (span := self.spans.pop(self.get_key(event), None)) is not None:
+            span.end()
+
+    def failed(self, event: CommandFailedEvent) -> None:
+        if (span := self.spans.pop(self.get_key(event), None)) is not None:
+            span.set_status(StatusCode.ERROR, str(event.failure.get("errmsg", "")))
+            span.end()
@@ -0,0 +1,71 @@
+from types import SimpleNamespace
+
+from aiohttp import ClientSession, TraceConfig, TraceRequestStartParams, TraceRequestEndParams, TraceRequestExceptionParams
+from slack_bolt.adapter.socket_mode.aiohttp import AsyncSocketModeHandler
+from slack_sdk.socket_mode.aiohttp import SocketModeClient
+from slack_sdk.socket_mode.request import SocketModeRequest
+
+from smib.tracing.tracer import SpanKind, StatusCode, get_tracer, get_current_span, start_span
+
+
+async def on_slack_request_start(session: ClientSession, context: SimpleNamespace, params: TraceRequestStartParams) -> None:
+    # Only calls made within a trace get a span, e.g. not the auth.test Bolt makes on startup
+    if get_current_span() is None:
+        context.span = None
+        return
+
+    # e.g. https://slack.com/api/chat.postMessage
+    method = params.url.path.rsplit("/", 1)[-1]
+    context.span = get_tracer().start_span(f"slack {method}", SpanKind.CLIENT, {
+        "rpc.system": "slack",
+        "rpc.method": method,
+        "http.request.method": params.method,
+        "server.address": params.url.host or "",
+    })
+
+
+async def on_slack_request_end(session: ClientSession, context: SimpleNamespace, params: TraceRequestEndParams) -> None:
+    if context.span is None:
+        return
+    context.span.set_attribute("http.response.status_code", params.response.status)
+    if params.response.status >= 400:
+        context.span.set_status(StatusCode.ERROR, f"HTTP {params.response.status}")
+    context.span.end()
+
+
+async def on_slack_request_exception(session: ClientSession, context: SimpleNamespace, params: TraceRequestExceptionParams) -> None:
+    if context.span is None:
+        return
+    context.span.record_exception(params.exception)
+    context.span.end()
+
+
+def create_slack_web_api_trace_config() -> TraceConfig:
+    """ Records a client span for every Slack Web API call made within a trace """
+    trace_config = TraceConfig()
+    trace_config.on_request_start.append(on_slack_request_start)
+    trace_config.on_request_end.append(on_slack_request_end)
+    trace_config.on_request_exception.append(on_slack_request_exception)
+    return trace_config
+
+
+def get_slack_request_name(body: dict) -> str:
+    if command := body.get("command"):
+        return command
+    if body.get("type") == "event_callback":
+        return f"event {body.get('event', {}).get('type')}"
+    if actions := body.get("actions"):
+        return f"{body.get('type')} {actions[0].get('action_id')}"
+    return str(body.get("type") or body.get("callback_id") or "unknown")
+
+
+class TracingAsyncSocketModeHandler(AsyncSocketModeHandler):
+    """
+    Starts a trace for each request received from Slack over socket mode, around the whole Bolt dispatch and the
+    acknowledgement, so the listeners and everything they call (including lazy listeners) are recorded under it.
+    Requests SMIB builds itself are already inside the trace of the HTTP request, websocket or job that built them.
+    """
+
+    async def handle(self, client: SocketModeClient, req: SocketModeRequest) -> None:
+        with start_span(f"slack {get_slack_request_name(req.payload)}", SpanKind.SERVER, {"slack.request.type": req.type}):
+            await super().handle(client, req)
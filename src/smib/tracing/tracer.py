@@ -0,0 +1,181 @@
+import random
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Iterator, Protocol, Sequence
+
+AttributeValue = str | bool | int | float
+
+TRACEPARENT_PATTERN: re.Pattern = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class SpanKind(IntEnum):
+    # Values as in OTLP
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+
+
+class StatusCode(IntEnum):
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+
+
+@dataclass(slots=True)
+class SpanEvent:
+    name: str
+    time_ns: int
+    attributes: dict[str, AttributeValue]
+
+
+@dataclass(slots=True, eq=False)
+class Span:
+    name: str
+    kind: SpanKind
+    context: SpanContext
+    parent_span_id: str | None
+    start_time_ns: int
+    attributes: dict[str, AttributeValue] = field(default_factory=dict)
+    end_time_ns: int | None = None
+    status: StatusCode = StatusCode.UNSET
+    status_message: str | None = None
+    events: list[SpanEvent] = field(default_factory=list)
+    # Spans started while tracing is off are handed out so callers never need to check, but go nowhere
+    recording: bool = True
+
+    def set_attribute(self, key: str, value: AttributeValue) -> None:
+        if self.recording:
+            self.attributes[key] = value
+
+    def set_status(self, status: StatusCode, message: str | None = None) -> None:
+        if self.recording:
+            self.status, self.status_message = status, message
+
+    def record_exception(self, exception: BaseException) -> None:
+        if self.recording:
+            self.events.append(SpanEvent("exception", time.time_ns(), {
+                "exception.type": type(exception).__qualname__,
+                "exception.message": str(exception),
+            }))
+            self.set_status(StatusCode.ERROR, f"{type(exception).__name__}: {exception}")
+
+    def end(self, end_time_ns: int | None = None) -> None:
+        if not self.recording or self.end_time_ns is not None:
+            return
+        self.end_time_ns = end_time_ns or time.time_ns()
+        get_tracer().on_end(self)
+
+
+NON_RECORDING_SPAN: Span = Span("", SpanKind.INTERNAL, SpanContext("0" * 32, "0" * 16), None, 0, recording=False)
+
+
+class SpanExporter(Protocol):
+    """ Receives finished spans in batches, off the event loop """
+
+    def export(self, spans: Sequence[Span]) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+class Tracer:
+    """
+    Creates spans and queues them once they end, for TracingService to hand to the exporter in batches.
+    Tracing is off (and starting a span costs next to nothing) until an exporter is set.
+    """
+    MAX_QUEUED_SPANS: int = 4096
+
+    def __init__(self):
+        self.exporter: SpanExporter | None = None
+        self.finished_spans: list[Span] = []
+        self.dropped_spans: int = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None
+
+    def set_exporter(self, exporter: SpanExporter | None) -> None:
+        self.exporter = exporter
+
+    def start_span(self, name: str, kind: SpanKind = SpanKind.INTERNAL, attributes: dict[str, AttributeValue] | None = None,
+                   parent: SpanContext | None = None) -> Span:
+        """ Starts a span, as a child of parent or else of the current span, without making it the current span """
+        if not self.enabled:
+            return NON_RECORDING_SPAN
+
+        if parent is None and (current_span := _current_span.get()) is not None:
+            parent = current_span.context
+
+        return Span(
+            name=name,
+            kind=kind,
+            context=SpanContext(parent.trace_id if parent else f"{random.getrandbits(128):032x}", f"{random.getrandbits(64):016x}"),
+            parent_span_id=parent.span_id if parent else None,
+            start_time_ns=time.time_ns(),
+            attributes=attributes or {},
+        )
+
+    def on_end(self, span: Span) -> None:
+        if len(self.finished_spans) >= self.MAX_QUEUED_SPANS:
+            self.dropped_spans += 1
+            return
+        self.finished_spans.append(span)
+
+    def drain(self) -> list[Span]:
+        spans, self.finished_spans = self.finished_spans, []
+        return spans
+
+
+_tracer: Tracer = Tracer()
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+
+
+def get_tracer() -> Tracer:
+    return _tracer
+
+
+def get_current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def start_span(name: str, kind: SpanKind = SpanKind.INTERNAL, attributes: dict[str, AttributeValue] | None = None,
+               parent: SpanContext | None = None) -> Iterator[Span]:
+    """
+    Starts a span and makes it the current span for everything awaited inside the block, including tasks created there
+    (which copy the context), e.g. Bolt's lazy listeners. Exceptions are recorded on the span and re-raised.
+    """
+    span = _tracer.start_span(name, kind, attributes, parent)
+    if not span.recording:
+        yield span
+        return
+
+    token = _current_span.set(span)
+    try:
+        yield span
+    except Exception as e:
+        span.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end()
+
+
+def parse_traceparent(traceparent: str | None) -> SpanContext | None:
+    """ The remote parent from a W3C traceparent header, if it is valid """
+    if traceparent is None or (match := TRACEPARENT_PATTERN.match(traceparent.strip().lower())) is None:
+        return None
+    trace_id, span_id = match.groups()
+    if trace_id == "0" * 32 or span_id == "0" * 16:
+        return None
+    return SpanContext(trace_id, span_id)
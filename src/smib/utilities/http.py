@@ -0,0 +1,12 @@
+from starlette.requests import Request
+
+from smib.events.middlewares.http_middleware import HttpRequestLoggingMiddleware
+
+
+def is_direct_local_request(request: Request) -> bool:
+    """ Whether the request came from this host, and not through the proxy (proxied requests can claim any client host) """
+    return (
+        request.client is not None
+        and request.client.host in HttpRequestLoggingMiddleware.LOCAL_HOSTS
+        and 'x-forwarded-for' not in request.headers
+    )
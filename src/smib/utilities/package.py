@@ -31,3 +31,6 @@ def get_actual_module_name(module: ModuleType) -> str:
 def get_module_from_name(module_name: str) -> ModuleType:
     return sys.modules[module_name]
 
+
+def is_package_installed(package_name: str) -> bool:
+    return importlib.util.find_spec(package_name) is not None
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from functools import wraps
+from typing import Callable, Awaitable, Hashable, TypeVar, ParamSpec
+
+from smib.metrics import get_metrics_registry
+
+T = TypeVar("T")
+P = ParamSpec("P")
+
+logger = logging.getLogger("SingleFlight")
+
+SINGLE_FLIGHT_CALLS = get_metrics_registry().counter(
+    "smib_single_flight_calls", "Calls made through a single flight group", ("group",))
+SINGLE_FLIGHT_COALESCED = get_metrics_registry().counter(
+    "smib_single_flight_coalesced_calls", "Calls that shared the result of another caller's call already in flight", ("group",))
+
+_single_flight_groups: dict[str, "SingleFlight"] = {}
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight coroutine, whose result (or exception) is shared
+    by every caller. Nothing is cached: once the call completes, the next call with that key runs again.
+    """
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.calls: int = 0
+        self.coalesced: int = 0
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self._calls_counter = SINGLE_FLIGHT_CALLS.labels(name)
+        self._coalesced_counter = SINGLE_FLIGHT_COALESCED.labels(name)
+        _single_flight_groups[name] = self
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        result, _ = await self.do_shared(key, func)
+        return result
+
+    async def do_shared(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """ As do(), also returning whether the result came from another caller's call """
+        self.calls += 1
+        self._calls_counter.inc()
+        if (future := self._in_flight.get(key)) is not None:
+            self.coalesced += 1
+            self._coalesced_counter.inc()
+            logger.debug(f"{self.name}: coalesced call for {key!r}")
+            # Shielded so a cancelled caller does not cancel the call for everyone else
+            return await asyncio.shield(future), True
+
+        future = asyncio.ensure_future(func())
+        self._in_flight[key] = future
+        future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return await asyncio.shield(future), False
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {
+            "calls": self.calls,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._in_flight),
+        }
+
+
+def default_key(*args, **kwargs) -> Hashable:
+    return args, tuple(sorted(kwargs.items()))
+
+
+def copy_model(result: T) -> T:
+    """ copy_result for functions returning a pydantic model (e.g. a Beanie document) or None """
+    return result.model_copy(deep=True) if result is not None else None
+
+
+def single_flight(func: Callable[P, Awaitable[T]] | None = None, *, key: Callable[..., Hashable] = default_key,
+                  name: str | None = None, copy_result: Callable[[T], T] | None = None):
+    """
+    Decorator coalescing concurrent calls of an async function made with the same arguments.
+    Use for reads only: without copy_result, every coalesced caller receives the same result object.
+
+    key: Callable taking the function's arguments and returning what calls are coalesced on (defaults to the arguments)
+    name: Group label in the smib_single_flight_* metrics and get_single_flight_stats() (defaults to the function's qualified name)
+    copy_result: Callable giving each coalesced caller its own copy of a mutable result, e.g. copy_model
+    """
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        group = SingleFlight(name or f"{func.__module__}.{func.__qualname__}")
+
+        @wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            result, shared = await group.do_shared(key(*args, **kwargs), lambda: func(*args, **kwargs))
+            return copy_result(result) if shared and copy_result is not None else result
+
+        wrapper.single_flight = group
+        return wrapper
+
+    return decorator(func) if func is not None else decorator
+
+
+def get_single_flight_stats() -> dict[str, dict[str, int]]:
+    """ Calls made and calls coalesced, per single flight group """
+    return {name: group.stats for name, group in _single_flight_groups.items()}